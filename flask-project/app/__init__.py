@@ -1,44 +1,57 @@
 ﻿from flask import Flask
 from flask_login import current_user
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import Config
-from .extensions import babel, csrf, db, login_manager, mail, migrate, select_locale
+from .assets.pipeline import asset_url
+from .extensions import (
+    babel,
+    compress,
+    csrf,
+    db,
+    limiter,
+    login_manager,
+    mail,
+    migrate,
+    select_locale,
+    server_sessions,
+    template_cache,
+)
+from .projects.activity import register_activity_listeners
+from .projects.counters import register_counter_listeners
+from .projects.schedule import register_schedule_listeners
+from .read_models import unread_notification_count
+from .sync.changes import register_sync_listeners
 from .utils.translations import translate
 
 
 def create_app(config_class: type[Config] | None = None) -> Flask:
     app = Flask(__name__, static_folder="../static", template_folder="../templates")
     app.config.from_object(config_class or Config)
+    if app.config.get("PROXY_FIX_X_FOR"):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
     register_extensions(app)
     register_blueprints(app)
+    register_counter_listeners()
+    register_activity_listeners()
+    register_schedule_listeners()
+    register_sync_listeners()
     register_context_processors(app)
 
-    with app.app_context():
-        db.create_all()
-        from .models import Task, User
-
-        pending = (
-            Task.query.filter(Task.assigned_to_id.isnot(None))
-            .filter(~Task.assignees.any())
-            .all()
-        )
-        if pending:
-            for task in pending:
-                user = User.query.get(task.assigned_to_id)
-                if user and user not in task.assignees:
-                    task.assignees.append(user)
-            db.session.commit()
-
     return app
 
 
 def register_extensions(app: Flask) -> None:
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, render_as_batch=True)
     login_manager.init_app(app)
     mail.init_app(app)
     babel.init_app(app, locale_selector=select_locale)
     csrf.init_app(app)
+    limiter.init_app(app)
+    compress.init_app(app)
+    server_sessions.init_app(app)
+    template_cache.init_app(app)
 
 
 @login_manager.user_loader
@@ -49,13 +62,19 @@ def load_user(user_id: str):
 
 
 def register_blueprints(app: Flask) -> None:
+    from .assets.routes import assets_bp
     from .auth.routes import auth_bp
     from .dashboard.routes import dashboard_bp
+    from .health.routes import health_bp
     from .projects.routes import projects_bp
+    from .sync.routes import sync_bp
 
+    app.register_blueprint(assets_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp)
+    app.register_blueprint(health_bp)
     app.register_blueprint(projects_bp)
+    app.register_blueprint(sync_bp)
 
 
 def register_context_processors(app: Flask) -> None:
@@ -63,9 +82,10 @@ def register_context_processors(app: Flask) -> None:
     def inject_globals():
         unread_count = 0
         if current_user.is_authenticated:
-            unread_count = sum(1 for n in current_user.notifications if not n.is_read)
+            unread_count = unread_notification_count(current_user.id)
         return {
             "t": lambda key, **kwargs: translate(key, **kwargs),
+            "asset_url": asset_url,
             "current_lang": "en",
             "app_name": app.config.get("APP_NAME", "Todo-List"),
             "unread_notifications_count": unread_count,
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from flask import current_app, url_for
+
+try:  # Optional: brotli is only needed to emit .br files at build time.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+ASSET_SOURCES = ("css/style.css", "js/main.js")
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+# Only trailing space after ":" is dropped; "a :hover" is a descendant selector.
+_CSS_COLON = re.compile(r":\s+")
+
+_manifest_cache: dict[str, tuple[float, dict[str, str]]] = {}
+
+
+def minify_css(source: str) -> str:
+    source = _CSS_COMMENT.sub("", source)
+    source = _CSS_SPACE.sub(" ", source)
+    source = _CSS_PUNCT.sub(r"\1", source)
+    source = _CSS_COLON.sub(":", source)
+    return source.replace(";}", "}").strip()
+
+
+def minify_js(source: str) -> str:
+    # Whitespace-only: safe without a JS parser as long as no template literal
+    # spans multiple lines, which main.js does not do.
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+def build_assets(static_folder: str | Path, sources=ASSET_SOURCES) -> dict[str, str]:
+    """Minify, fingerprint and precompress ``sources`` into ``static/dist``.
+
+    Returns the manifest mapping source names to their hashed dist paths.
+    """
+    static_folder = Path(static_folder)
+    dist = static_folder / DIST_DIR
+    dist.mkdir(parents=True, exist_ok=True)
+
+    manifest: dict[str, str] = {}
+    for name in sources:
+        source = static_folder / name
+        minify = MINIFIERS.get(source.suffix, lambda text: text)
+        data = minify(source.read_text(encoding="utf-8-sig")).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:12]
+
+        hashed = Path(name).with_name(f"{source.stem}.{digest}{source.suffix}")
+        target = dist / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        target.with_name(target.name + ".gz").write_bytes(gzip.compress(data, 9, mtime=0))
+        if brotli is not None:
+            target.with_name(target.name + ".br").write_bytes(brotli.compress(data, quality=11))
+        manifest[name] = hashed.as_posix()
+
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    _manifest_cache.clear()
+    return manifest
+
+
+def load_manifest(static_folder: str | Path) -> dict[str, str]:
+    path = Path(static_folder) / DIST_DIR / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    _manifest_cache[str(path)] = (mtime, manifest)
+    return manifest
+
+
+def asset_url(filename: str) -> str:
+    """``url_for('static', filename=...)`` that prefers the built, hashed file."""
+    if current_app.config.get("ASSETS_USE_MANIFEST", True):
+        hashed = load_manifest(current_app.static_folder).get(filename)
+        if hashed:
+            return url_for("assets.dist", filename=hashed)
+    return url_for("static", filename=filename)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import mimetypes
+
+import click
+from flask import Blueprint, current_app, request, send_from_directory
+from werkzeug.exceptions import NotFound
+
+from .pipeline import DIST_DIR, build_assets
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+# Preferred first; each entry is (Accept-Encoding token, file suffix).
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+@assets_bp.route("/<path:filename>")
+def dist(filename: str):
+    directory = f"{current_app.static_folder}/{DIST_DIR}"
+    accepted = request.accept_encodings
+
+    for encoding, suffix in PRECOMPRESSED:
+        if not accepted[encoding]:
+            continue
+        try:
+            response = send_from_directory(directory, filename + suffix, conditional=True)
+        except NotFound:
+            continue
+        response.content_encoding = encoding
+        response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        break
+    else:
+        response = send_from_directory(directory, filename, conditional=True)
+
+    # Names are content-hashed, so a given URL never changes.
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@assets_bp.cli.command("build")
+def build_command() -> None:
+    """Minify, fingerprint and precompress static assets into static/dist."""
+    manifest = build_assets(current_app.static_folder)
+    for source, hashed in manifest.items():
+        click.echo(f"{source} -> {DIST_DIR}/{hashed}")
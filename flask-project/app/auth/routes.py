@@ -1,22 +1,25 @@
 from __future__ import annotations
 
-import base64
+import hashlib
 import io
-import pyotp
-import qrcode
+from functools import lru_cache
+
 from flask import (
     Blueprint,
     current_app,
     flash,
+    make_response,
     redirect,
     render_template,
+    request,
     session,
     url_for,
 )
 from flask_login import current_user, login_required, login_user, logout_user
 
-from ..extensions import db
+from ..extensions import db, limiter, server_sessions
 from ..models import User
+from ..utils.ratelimit import client_ip
 from .forms import (
     LoginForm,
     RegistrationForm,
@@ -27,8 +30,14 @@ from .forms import (
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 
+def _login_account() -> str | None:
+    email = request.form.get("email", "")
+    return email.strip().lower() or None
 
 
+def _pending_2fa_account() -> str | None:
+    user_id = session.get("pre_2fa_user_id")
+    return str(user_id) if user_id else None
 
 
 @auth_bp.route("/register", methods=["GET", "POST"])
@@ -60,38 +69,57 @@ def register():
 
 
 
-def _build_totp_qr_data(user: User) -> str:
+# pyotp and qrcode (which pulls in Pillow) are imported on first use: only the
+# 2FA pages need them, and every worker boot and CLI call would pay otherwise.
+def _totp(secret: str):
+    import pyotp
+
+    return pyotp.TOTP(secret)
+
+
+def _provisioning_uri(user: User) -> str:
     if not user.two_factor_secret:
+        import pyotp
+
         user.two_factor_secret = pyotp.random_base32()
         db.session.commit()
 
-    totp = pyotp.TOTP(user.two_factor_secret)
+    totp = _totp(user.two_factor_secret)
     issuer = current_app.config.get("APP_NAME", "Flask Todo Pro")
-    provisioning_uri = totp.provisioning_uri(name=user.email, issuer_name=issuer)
+    return totp.provisioning_uri(name=user.email, issuer_name=issuer)
+
+
+@lru_cache(maxsize=256)
+def _render_qr_png(provisioning_uri: str) -> bytes:
+    import qrcode
 
     img = qrcode.make(provisioning_uri)
     buffered = io.BytesIO()
     img.save(buffered, format="PNG")
-    img_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
-    return f"data:image/png;base64,{img_base64}", provisioning_uri
+    return buffered.getvalue()
 
 
-@auth_bp.route("/setup-2fa", methods=["GET", "POST"])
-def setup_2fa():
+def _pending_setup_user_id() -> int | None:
     user_id = session.get("setup_2fa_user_id")
     if current_user.is_authenticated and not user_id:
         user_id = current_user.id
+    return user_id
+
+
+@auth_bp.route("/setup-2fa", methods=["GET", "POST"])
+def setup_2fa():
+    user_id = _pending_setup_user_id()
     if not user_id:
         flash("No user pending two-factor setup.", "warning")
         return redirect(url_for("auth.login"))
 
     user = User.query.get_or_404(user_id)
     form = TwoFactorForm()
-    qr_data, provisioning_uri = _build_totp_qr_data(user)
+    provisioning_uri = _provisioning_uri(user)
 
     if form.validate_on_submit():
         token = form.token.data
-        totp = pyotp.TOTP(user.two_factor_secret)
+        totp = _totp(user.two_factor_secret)
         if totp.verify(token, valid_window=1):
             session.pop("setup_2fa_user_id", None)
             flash("Two-factor authentication enabled. You can log in now.", "success")
@@ -101,13 +129,36 @@ def setup_2fa():
     return render_template(
         "auth/setup_2fa.html",
         form=form,
-        qr_data=qr_data,
         provisioning_uri=provisioning_uri,
         email=user.email,
     )
 
 
+@auth_bp.route("/setup-2fa/qr.png")
+def setup_2fa_qr():
+    user_id = _pending_setup_user_id()
+    if not user_id:
+        return "", 404
+
+    user = User.query.get_or_404(user_id)
+    provisioning_uri = _provisioning_uri(user)
+    etag = hashlib.sha256(provisioning_uri.encode("utf-8")).hexdigest()[:32]
+    max_age = current_app.config.get("TOTP_QR_MAX_AGE", 300)
+
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(_render_qr_png(provisioning_uri))
+        response.mimetype = "image/png"
+    response.set_etag(etag)
+    # The image encodes the TOTP secret, so it must never land in a shared cache.
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    response.vary.add("Cookie")
+    return response
+
+
 @auth_bp.route("/login", methods=["GET", "POST"])
+@limiter.limit("login", ip=client_ip, account=_login_account)
 def login():
     if current_user.is_authenticated:
         return redirect(url_for("dashboard.home"))
@@ -134,6 +185,7 @@ def login():
 
 
 @auth_bp.route("/verify-2fa", methods=["GET", "POST"])
+@limiter.limit("verify_2fa", ip=client_ip, account=_pending_2fa_account)
 def verify_2fa():
     if current_user.is_authenticated:
         return redirect(url_for("dashboard.home"))
@@ -147,8 +199,9 @@ def verify_2fa():
     form = TwoFactorForm()
     if form.validate_on_submit():
         token = form.token.data
-        totp = pyotp.TOTP(user.two_factor_secret)
+        totp = _totp(user.two_factor_secret)
         if totp.verify(token, valid_window=1):
+            server_sessions.regenerate()
             login_user(user)
             session.pop("pre_2fa_user_id", None)
             flash("Welcome back!", "success")
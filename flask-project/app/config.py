@@ -26,6 +26,33 @@ class Config:
 
     OTP_EXPIRATION_MINUTES = int(os.environ.get("OTP_EXPIRATION_MINUTES", 10))
     TASK_DEADLINE_WARNING_DAYS = int(os.environ.get("TASK_DEADLINE_WARNING_DAYS", 2))
+    BOARD_STREAM_BATCH = int(os.environ.get("BOARD_STREAM_BATCH", 500))
+    BOARD_STREAM_CHUNK_SIZE = int(os.environ.get("BOARD_STREAM_CHUNK_SIZE", 8192))
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+    PROJECT_PURGE_BATCH_SIZE = int(os.environ.get("PROJECT_PURGE_BATCH_SIZE", 1000))
+    ACTIVITY_PAGE_SIZE = int(os.environ.get("ACTIVITY_PAGE_SIZE", 50))
+    ACTIVITY_RETENTION_MONTHS = int(os.environ.get("ACTIVITY_RETENTION_MONTHS", 12))
+    ANALYTICS_MAX_DAYS = int(os.environ.get("ANALYTICS_MAX_DAYS", 365))
+    MY_TASKS_PAGE_SIZE = int(os.environ.get("MY_TASKS_PAGE_SIZE", 50))
+    BULK_INVITE_LIMIT = int(os.environ.get("BULK_INVITE_LIMIT", 500))
+    RECURRENCE_HORIZON_DAYS = int(os.environ.get("RECURRENCE_HORIZON_DAYS", 14))
+    SCHEDULE_CACHE_SIZE = int(os.environ.get("SCHEDULE_CACHE_SIZE", 256))
+    DIGEST_BATCH_SIZE = int(os.environ.get("DIGEST_BATCH_SIZE", 200))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("SYNC_TOMBSTONE_RETENTION_DAYS", 90))
+    TOTP_QR_MAX_AGE = int(os.environ.get("TOTP_QR_MAX_AGE", 300))
+
+    RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "true").lower() == "true"
+    RATELIMIT_STORE = os.environ.get("RATELIMIT_STORE")
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is
+    # trusted. 0 keeps remote_addr, which behind a proxy is the proxy's own.
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+    # (attempts, window in seconds) per "<scope>.<key>".
+    RATELIMIT_LIMITS = {
+        "login.ip": (30, 60),
+        "login.account": (10, 300),
+        "verify_2fa.ip": (30, 60),
+        "verify_2fa.account": (10, 300),
+    }
 
 
     UPLOAD_FOLDER = os.environ.get(
@@ -34,3 +61,28 @@ class Config:
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024
 
     SESSION_COOKIE_SECURE = False
+    # Keep session data server-side; the cookie only carries a signed id.
+    # Needs SESSION_STORE, which every worker must share.
+    SESSION_SERVER_SIDE = os.environ.get("SESSION_SERVER_SIDE", "false").lower() == "true"
+    SESSION_STORE = os.environ.get("SESSION_STORE")
+
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+    COMPRESS_BR_LEVEL = int(os.environ.get("COMPRESS_BR_LEVEL", 4))
+    # Streamed responses are flushed to the client after this many input bytes.
+    COMPRESS_STREAM_FLUSH_SIZE = int(os.environ.get("COMPRESS_STREAM_FLUSH_SIZE", 8192))
+
+    ASSETS_USE_MANIFEST = os.environ.get("ASSETS_USE_MANIFEST", "true").lower() == "true"
+
+    # "filesystem", "none" or an import path to a jinja2.BytecodeCache subclass.
+    TEMPLATE_BYTECODE_CACHE = os.environ.get("TEMPLATE_BYTECODE_CACHE", "filesystem")
+    TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR", str(INSTANCE_DIR / "jinja_cache"))
+
+    # Thread pool size per process when served through asgi.py.
+    ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 32))
+
+
+class ProductionConfig(Config):
+    # Never stat template files on render; deploys restart the workers.
+    TEMPLATES_AUTO_RELOAD = False
@@ -1,7 +1,7 @@
 ﻿from __future__ import annotations
 
 from flask_wtf import FlaskForm
-from wtforms import FileField, PasswordField, StringField, SubmitField
+from wtforms import FileField, PasswordField, SelectField, StringField, SubmitField
 from wtforms.validators import DataRequired, EqualTo, Length
 
 
@@ -15,6 +15,19 @@ class AvatarForm(FlaskForm):
     submit = SubmitField("Upload")
 
 
+class NotificationPreferencesForm(FlaskForm):
+    delivery = SelectField(
+        "Email Notifications",
+        choices=[
+            ("instant", "Instantly, one email per event"),
+            ("digest", "Daily digest, one summary per day"),
+        ],
+    )
+    # Not "submit": the profile forms share that name, so it would be set on
+    # every POST to the page.
+    save_preferences = SubmitField("Save Preferences")
+
+
 class PasswordForm(FlaskForm):
     current_password = PasswordField("Current Password", validators=[DataRequired()])
     new_password = PasswordField("New Password", validators=[DataRequired(), Length(min=8, max=128)])
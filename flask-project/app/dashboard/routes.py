@@ -1,88 +1,59 @@
 ﻿from __future__ import annotations
 
+import base64
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import click
 from flask import (
     Blueprint,
     current_app,
+    abort,
     flash,
+    jsonify,
     redirect,
     render_template,
     request,
     url_for,
 )
 from flask_login import current_user, login_required
+from sqlalchemy import and_, or_, select, update
 
-from ..extensions import db
-from ..models import Notification, NotificationType, Project, Role, TaskStatus
+from ..extensions import db, server_sessions
+from ..models import (
+    Membership,
+    Notification,
+    NotificationDelivery,
+    NotificationType,
+    Project,
+    Task,
+    TaskStatus,
+    task_members,
+)
 from ..projects.forms import ProjectForm
-from ..utils.notifications import ensure_deadline_notifications
-from .forms import AvatarForm, PasswordForm, ProfileForm
+from ..read_models import archived_projects, notification_rows, project_cards
+from ..utils.notifications import ensure_deadline_notifications, send_digests
+from .forms import AvatarForm, NotificationPreferencesForm, PasswordForm, ProfileForm
 
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
 
-def _collect_projects() -> list[dict[str, object]]:
-    owned_projects = (
-        current_user.owned_projects.order_by(Project.created_at.desc()).all()
-        if hasattr(current_user.owned_projects, "order_by")
-        else list(current_user.owned_projects)
-    )
-
-    entries: list[dict[str, object]] = []
-    project_ids: set[int] = set()
-
-    for project in owned_projects:
-        entries.append({"project": project, "role": "owner"})
-        project_ids.add(project.id)
-
-    membership_entries = (
-        current_user.memberships.filter_by(is_active=True).all()
-        if hasattr(current_user.memberships, "filter_by")
-        else list(current_user.memberships)
-    )
-
-    for membership in membership_entries:
-        project = membership.project
-        if not project or project.id in project_ids:
-            continue
-        role = "owner" if membership.role == Role.OWNER else "member"
-        entries.append({"project": project, "role": role})
-        project_ids.add(project.id)
-
-    entries.sort(
-        key=lambda item: getattr(item["project"], "created_at", None) or item["project"].id,
-        reverse=True,
-    )
-    return entries
-
-
 @dashboard_bp.route("/")
 @login_required
 def home():
-    ensure_deadline_notifications(current_user)
+    if ensure_deadline_notifications(current_user):
+        db.session.commit()
 
     project_form = ProjectForm()
-    projects = _collect_projects()
-    deadline_notifications = (
-        Notification.query.filter_by(
-            user_id=current_user.id, type=NotificationType.DEADLINE
-        )
-        .order_by(Notification.created_at.desc())
-        .limit(5)
-        .all()
+    projects = project_cards(current_user.id)
+    deadline_notifications = notification_rows(
+        current_user.id, type=NotificationType.DEADLINE, limit=5
     )
 
-    total_tasks = 0
-    completed_tasks = 0
-    owned_count = sum(1 for entry in projects if entry["role"] == "owner")
-    for entry in projects:
-        project = entry.get("project")
-        for task in getattr(project, "tasks", []):
-            total_tasks += 1
-            if task.status == TaskStatus.DONE:
-                completed_tasks += 1
+    owned_count = sum(1 for project in projects if project.role == "owner")
+    total_tasks = sum(project.tasks_total for project in projects)
+    completed_tasks = sum(project.tasks_done for project in projects)
     active_tasks = total_tasks - completed_tasks
     stats = {
         "projects": len(projects),
@@ -98,6 +69,7 @@ def home():
         projects=projects,
         deadline_notifications=deadline_notifications,
         stats=stats,
+        archived_projects=archived_projects(current_user.id),
     )
 
 
@@ -114,6 +86,7 @@ def profile():
     profile_form = ProfileForm(obj=current_user)
     avatar_form = AvatarForm()
     password_form = PasswordForm()
+    preferences_form = NotificationPreferencesForm(delivery=current_user.notification_delivery.value)
 
     handled = False
 
@@ -144,9 +117,25 @@ def profile():
         else:
             current_user.set_password(password_form.new_password.data)
             db.session.commit()
+            server_sessions.revoke_user(current_user.id, keep_current=True)
             flash("Password changed successfully.", "success")
             handled = True
 
+    if preferences_form.save_preferences.data and preferences_form.validate_on_submit():
+        delivery = NotificationDelivery(preferences_form.delivery.data)
+        if delivery != current_user.notification_delivery:
+            current_user.notification_delivery = delivery
+            if delivery == NotificationDelivery.DIGEST:
+                # The first digest covers what happens from now on, not the backlog.
+                db.session.execute(
+                    update(Notification)
+                    .where(Notification.user_id == current_user.id, Notification.emailed_at.is_(None))
+                    .values(emailed_at=datetime.utcnow())
+                )
+            db.session.commit()
+        flash("Notification preferences saved.", "success")
+        handled = True
+
     if handled:
         return redirect(url_for("dashboard.profile"))
 
@@ -155,18 +144,16 @@ def profile():
         profile_form=profile_form,
         avatar_form=avatar_form,
         password_form=password_form,
+        preferences_form=preferences_form,
     )
 
 
 @dashboard_bp.route("/notifications")
 @login_required
 def notifications():
-    notifications = (
-        Notification.query.filter_by(user_id=current_user.id)
-        .order_by(Notification.created_at.desc())
-        .all()
+    return render_template(
+        "dashboard/notifications.html", notifications=notification_rows(current_user.id)
     )
-    return render_template("dashboard/notifications.html", notifications=notifications)
 
 
 @dashboard_bp.route("/notifications/<int:notification_id>/read", methods=["POST"])
@@ -179,3 +166,140 @@ def mark_notification_read(notification_id: int):
     db.session.commit()
     flash("Notification marked as read.", "info")
     return redirect(request.referrer or url_for("dashboard.notifications"))
+
+
+MY_TASK_WINDOWS = ("overdue", "today", "week", "month")
+
+
+def _encode_cursor(due_date: datetime | None, task_id: int) -> str:
+    raw = f"{due_date.isoformat() if due_date else ''}|{task_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        due, task_id = raw.split("|")
+        return (datetime.fromisoformat(due) if due else None), int(task_id)
+    except (ValueError, UnicodeDecodeError):
+        abort(400)
+
+
+def _my_tasks_page(status: str | None, window: str | None, cursor: str | None, limit: int):
+    """One keyset page of tasks assigned to the current user, soonest due first.
+
+    Rows come from the (user_id, task_id) task_members index joined to the
+    user's active memberships. Paging seeks past the last (due_date, id) pair
+    instead of using OFFSET, so page N costs the same as page 1.
+    """
+    query = (
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.due_date,
+            Task.project_id,
+            Project.name.label("project_name"),
+            Task.is_overdue.label("overdue"),
+        )
+        .join(task_members, task_members.c.task_id == Task.id)
+        .join(Project, Project.id == Task.project_id)
+        .join(
+            Membership,
+            and_(
+                Membership.project_id == Task.project_id,
+                Membership.user_id == task_members.c.user_id,
+                Membership.is_active.is_(True),
+            ),
+        )
+        .where(task_members.c.user_id == current_user.id, Project.active_filter())
+    )
+
+    if status:
+        query = query.where(Task.status == TaskStatus(status))
+
+    now = datetime.utcnow()
+    if window == "overdue":
+        query = query.where(Task.is_overdue)
+    elif window in MY_TASK_WINDOWS:
+        days = {"today": 1, "week": 7, "month": 30}[window]
+        query = query.where(Task.due_date >= now, Task.due_date < now + timedelta(days=days))
+
+    if cursor:
+        due, last_id = _decode_cursor(cursor)
+        if due is None:
+            query = query.where(Task.due_date.is_(None), Task.id > last_id)
+        else:
+            query = query.where(
+                or_(
+                    Task.due_date > due,
+                    and_(Task.due_date == due, Task.id > last_id),
+                    Task.due_date.is_(None),
+                )
+            )
+
+    rows = db.session.execute(
+        query.order_by(Task.due_date.asc().nulls_last(), Task.id.asc()).limit(limit + 1)
+    ).all()
+    next_cursor = _encode_cursor(rows[limit - 1].due_date, rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def _my_tasks_args() -> tuple[str | None, str | None, str | None, int]:
+    status = request.args.get("status") or None
+    window = request.args.get("window") or None
+    if status and status not in {item.value for item in TaskStatus}:
+        abort(400)
+    if window and window not in MY_TASK_WINDOWS:
+        abort(400)
+    max_limit = current_app.config.get("MY_TASKS_PAGE_SIZE", 50)
+    limit = min(request.args.get("limit", max_limit, type=int) or max_limit, max_limit)
+    return status, window, request.args.get("cursor") or None, limit
+
+
+@dashboard_bp.route("/my-tasks")
+@login_required
+def my_tasks():
+    status, window, cursor, limit = _my_tasks_args()
+    tasks, next_cursor = _my_tasks_page(status, window, cursor, limit)
+    return render_template(
+        "dashboard/my_tasks.html",
+        tasks=tasks,
+        next_cursor=next_cursor,
+        status=status,
+        window=window,
+        windows=MY_TASK_WINDOWS,
+    )
+
+
+@dashboard_bp.route("/my-tasks.json")
+@login_required
+def my_tasks_api():
+    status, window, cursor, limit = _my_tasks_args()
+    tasks, next_cursor = _my_tasks_page(status, window, cursor, limit)
+    return jsonify(
+        tasks=[
+            {
+                "id": task.id,
+                "title": task.title,
+                "status": task.status.value,
+                "due_date": task.due_date.isoformat() if task.due_date else None,
+                "overdue": bool(task.overdue),
+                "project_id": task.project_id,
+                "project_name": task.project_name,
+                "url": url_for("projects.detail", project_id=task.project_id),
+            }
+            for task in tasks
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@dashboard_bp.cli.command("send-digests")
+@click.option("--batch-size", type=int, default=None, help="Defaults to DIGEST_BATCH_SIZE.")
+def send_digests_command(batch_size: int | None) -> None:
+    """Email today's notification digest to users who chose daily delivery."""
+    if batch_size is None:
+        batch_size = current_app.config.get("DIGEST_BATCH_SIZE", 200)
+    sent = send_digests(batch_size=batch_size)
+    click.echo(f"Sent {sent} digest email{'' if sent == 1 else 's'}.")
@@ -4,17 +4,26 @@ from flask import flash, redirect, url_for
 from flask_babel import Babel
 from flask_login import LoginManager
 from flask_mail import Mail
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf.csrf import CSRFProtect
 
+from .utils.compression import Compress
+from .utils.migrations import DeferredMigrate
+from .utils.ratelimit import RateLimiter
+from .utils.sessions import ServerSideSessions
+from .utils.templates import TemplateCache
+
 
 db = SQLAlchemy()
 login_manager = LoginManager()
 mail = Mail()
-migrate = Migrate()
+migrate = DeferredMigrate()
 babel = Babel()
 csrf = CSRFProtect()
+limiter = RateLimiter()
+compress = Compress()
+server_sessions = ServerSideSessions()
+template_cache = TemplateCache()
 
 
 login_manager.login_view = "auth.login"
@@ -38,5 +47,9 @@ __all__ = [
     "migrate",
     "babel",
     "csrf",
+    "limiter",
+    "compress",
+    "server_sessions",
+    "template_cache",
     "select_locale",
 ]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..extensions import db
+
+health_bp = Blueprint("health", __name__, url_prefix="/healthz")
+
+
+@health_bp.route("/live")
+def live():
+    return jsonify(status="ok", pid=os.getpid())
+
+
+@health_bp.route("/startup")
+def startup():
+    """Startup/readiness probe: 200 once this worker can reach the database."""
+    startup_info = current_app.extensions.get("startup", {})
+    try:
+        db.session.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify(status="starting", pid=os.getpid()), 503
+    return jsonify(status="ready", pid=os.getpid(), **startup_info)
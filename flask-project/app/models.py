@@ -1,10 +1,11 @@
 ﻿from __future__ import annotations
 
 import enum
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from flask_login import UserMixin
-from sqlalchemy import Enum, UniqueConstraint
+from sqlalchemy import Enum, UniqueConstraint, and_, bindparam, null
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .extensions import db
@@ -17,6 +18,13 @@ class TimestampMixin:
     )
 
 
+class SyncRevisionMixin:
+    # Commit-ordered revision for delta sync, stamped by app.sync.changes right
+    # before the writing transaction commits. Every UPDATE, ORM or Core, sets
+    # it back to NULL so the row is stamped again.
+    sync_rev = db.Column(db.Integer, onupdate=null())
+
+
 class Role(enum.StrEnum):
     OWNER = "owner"
     MEMBER = "member"
@@ -34,16 +42,65 @@ class TaskStatus(enum.StrEnum):
     DONE = "done"
 
 
+class RecurrenceFrequency(enum.StrEnum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
 class NotificationType(enum.StrEnum):
     INVITE = "invite"
     DEADLINE = "deadline"
 
 
+class NotificationDelivery(enum.StrEnum):
+    INSTANT = "instant"
+    DIGEST = "digest"
+
+
+class SyncEntity(enum.StrEnum):
+    PROJECT = "project"
+    TASK = "task"
+    MEMBERSHIP = "membership"
+    NOTIFICATION = "notification"
+
+
+class ActivityAction(enum.StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    MOVED = "moved"
+    DELETED = "deleted"
+
+
 task_members = db.Table(
     "task_members",
-    db.Column("task_id", db.Integer, db.ForeignKey("tasks.id"), primary_key=True),
+    db.Column("task_id", db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
     db.Column("user_id", db.Integer, db.ForeignKey("users.id"), primary_key=True),
 )
+# The primary key leads with task_id; per-user lookups ("My tasks") need the reverse.
+db.Index("ix_task_members_user_task", task_members.c.user_id, task_members.c.task_id)
+
+# ``task_id`` cannot start before ``blocker_id`` is done. The primary key
+# serves predecessor lookups, the blocker index successor walks, and
+# ``project_id`` loads a whole project's graph in one range scan.
+task_dependencies = db.Table(
+    "task_dependencies",
+    db.Column(
+        "project_id", db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    ),
+    db.Column("task_id", db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("blocker_id", db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+)
+db.Index("ix_task_dependencies_blocker", task_dependencies.c.blocker_id, task_dependencies.c.task_id)
+
+
+def initials_for(name: str) -> str:
+    words = [part for part in name.strip().split() if part]
+    if not words:
+        return "?"
+    if len(words) == 1:
+        return words[0][0].upper()
+    return (words[0][0] + words[1][0]).upper()
 
 
 class User(UserMixin, TimestampMixin, db.Model):
@@ -57,6 +114,13 @@ class User(UserMixin, TimestampMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
     two_factor_secret = db.Column(db.String(32))
+    notification_delivery = db.Column(
+        Enum(NotificationDelivery),
+        nullable=False,
+        default=NotificationDelivery.INSTANT,
+        server_default=NotificationDelivery.INSTANT.name,
+    )
+    last_digest_at = db.Column(db.DateTime)
 
     owned_projects = db.relationship("Project", backref="owner", lazy="dynamic")
     memberships = db.relationship("Membership", back_populates="user", lazy="dynamic")
@@ -78,12 +142,7 @@ class User(UserMixin, TimestampMixin, db.Model):
 
     @property
     def initials(self) -> str:
-        words = [part for part in self.name.strip().split() if part]
-        if not words:
-            return "?"
-        if len(words) == 1:
-            return words[0][0].upper()
-        return (words[0][0] + words[1][0]).upper()
+        return initials_for(self.name)
 
     def __repr__(self) -> str:
         return f"<User {self.email}>"
@@ -104,13 +163,23 @@ class OTPToken(TimestampMixin, db.Model):
         return (not self.is_used) and datetime.utcnow() <= self.expires_at
 
 
-class Project(TimestampMixin, db.Model):
+class Project(SyncRevisionMixin, TimestampMixin, db.Model):
     __tablename__ = "projects"
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text)
     owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    archived_at = db.Column(db.DateTime)
+    deleted_at = db.Column(db.DateTime)
+    # Maintained on every task flush by app.projects.counters.
+    tasks_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    tasks_todo = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    tasks_in_progress = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    tasks_done = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Bumped whenever a task's schedule inputs or a dependency edge change, so
+    # cached schedules (app.projects.schedule) know when to recompute.
+    schedule_rev = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     memberships = db.relationship(
         "Membership",
@@ -127,11 +196,29 @@ class Project(TimestampMixin, db.Model):
         cascade="all, delete-orphan",
     )
 
+    @property
+    def is_archived(self) -> bool:
+        return self.archived_at is not None
+
+    @classmethod
+    def active_filter(cls):
+        return db.and_(cls.archived_at.is_(None), cls.deleted_at.is_(None))
+
     def __repr__(self) -> str:
         return f"<Project {self.name}>"
 
 
-class Membership(TimestampMixin, db.Model):
+# Dashboards only ever list live projects, so index just those rows.
+db.Index(
+    "ix_projects_owner_live",
+    Project.owner_id,
+    Project.created_at,
+    sqlite_where=Project.active_filter(),
+    postgresql_where=Project.active_filter(),
+)
+
+
+class Membership(SyncRevisionMixin, TimestampMixin, db.Model):
     __tablename__ = "memberships"
     __table_args__ = (
         UniqueConstraint("user_id", "project_id", name="uq_member_project"),
@@ -139,7 +226,9 @@ class Membership(TimestampMixin, db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
     role = db.Column(Enum(Role), nullable=False, default=Role.MEMBER)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
 
@@ -150,11 +239,17 @@ class Membership(TimestampMixin, db.Model):
         return f"<Membership user={self.user_id} project={self.project_id} {self.role}>"
 
 
+# Delta sync scans each project's rows by sync revision.
+db.Index("ix_memberships_project_sync", Membership.project_id, Membership.sync_rev)
+
+
 class Invitation(TimestampMixin, db.Model):
     __tablename__ = "invitations"
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
     inviter_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     invitee_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     status = db.Column(Enum(InvitationStatus), default=InvitationStatus.PENDING, nullable=False)
@@ -175,18 +270,45 @@ class Invitation(TimestampMixin, db.Model):
         self.responded_at = datetime.utcnow()
 
 
-class Task(TimestampMixin, db.Model):
+class Task(SyncRevisionMixin, TimestampMixin, db.Model):
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_due_date_id", "due_date", "id"),
+        # One instance per series slot; makes overlapping scheduler runs harmless.
+        UniqueConstraint("recurrence_parent_id", "due_date", name="uq_task_recurrence_slot"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text)
     due_date = db.Column(db.DateTime)
-    status = db.Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
+    # Load the old status before overwriting an expired one, so counters and
+    # the activity log always see the move in the attribute history.
+    status = db.column_property(
+        db.Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False), active_history=True
+    )
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     assigned_to_id = db.Column(db.Integer, db.ForeignKey("users.id"))
 
+    # Set on the task that defines a series; instances only carry the parent id.
+    recurrence_freq = db.Column(Enum(RecurrenceFrequency))
+    recurrence_interval = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    recurrence_until = db.Column(db.DateTime)
+    recurrence_count = db.Column(db.Integer)
+    recurrence_generated = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    recurrence_next_at = db.Column(db.DateTime, index=True)
+    recurrence_parent_id = db.Column(
+        db.Integer, db.ForeignKey("tasks.id", ondelete="SET NULL"), index=True
+    )
+    # Bumped by every ORM UPDATE, which also checks it, so concurrent edits
+    # fail with StaleDataError instead of overwriting each other.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
     project = db.relationship("Project", back_populates="tasks")
     creator = db.relationship(
         "User", foreign_keys=[created_by_id], back_populates="tasks_created"
@@ -195,14 +317,58 @@ class Task(TimestampMixin, db.Model):
         "User", secondary=task_members, back_populates="tasks_assigned"
     )
 
+    # The deadline helpers below work on instances and as SQL expressions, so
+    # views filter on them in the query instead of looping over loaded tasks.
+    @hybrid_property
+    def is_open(self) -> bool:
+        return self.status != TaskStatus.DONE
+
+    @is_open.inplace.expression
+    @classmethod
+    def _is_open_expression(cls):
+        # Rendered inline: SQLite only matches a partial index against literals.
+        return cls.status != bindparam(
+            "done_status", TaskStatus.DONE, type_=cls.status.type, unique=True, literal_execute=True
+        )
+
+    @hybrid_property
+    def is_overdue(self) -> bool:
+        return self.is_open and self.due_date is not None and self.due_date < datetime.utcnow()
+
+    @is_overdue.inplace.expression
+    @classmethod
+    def _is_overdue_expression(cls):
+        return and_(cls.is_open, cls.due_date.isnot(None), cls.due_date < datetime.utcnow())
+
+    @hybrid_method
     def is_due_soon(self, threshold_days: int) -> bool:
-        if not self.due_date:
+        if not self.is_open or self.due_date is None:
             return False
-        delta = self.due_date - datetime.utcnow()
-        return 0 <= delta.days < threshold_days or (0 <= delta.total_seconds() <= threshold_days * 86400)
+        now = datetime.utcnow()
+        return now <= self.due_date <= now + timedelta(days=threshold_days)
+
+    @is_due_soon.inplace.expression
+    @classmethod
+    def _is_due_soon_expression(cls, threshold_days: int):
+        now = datetime.utcnow()
+        return and_(cls.is_open, cls.due_date.between(now, now + timedelta(days=threshold_days)))
+
+
+# Deadline scans only care about unfinished work, which stays a small slice
+# of the table as projects age.
+db.Index(
+    "ix_tasks_open_due_date",
+    Task.due_date,
+    Task.id,
+    sqlite_where=and_(Task.due_date.isnot(None), Task.is_open),
+    postgresql_where=and_(Task.due_date.isnot(None), Task.is_open),
+)
+
 
+db.Index("ix_tasks_project_sync", Task.project_id, Task.sync_rev)
 
-class Notification(TimestampMixin, db.Model):
+
+class Notification(SyncRevisionMixin, TimestampMixin, db.Model):
     __tablename__ = "notifications"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -211,6 +377,8 @@ class Notification(TimestampMixin, db.Model):
     reference = db.Column(db.String(120), index=True)
     payload = db.Column(db.JSON, nullable=False, default=dict)
     is_read = db.Column(db.Boolean, default=False, nullable=False)
+    # Set once the notification went out by email, instantly or in a digest.
+    emailed_at = db.Column(db.DateTime)
 
     user = db.relationship("User", back_populates="notifications")
 
@@ -218,6 +386,114 @@ class Notification(TimestampMixin, db.Model):
         self.is_read = True
 
 
+db.Index("ix_notifications_user_sync", Notification.user_id, Notification.sync_rev)
+# The digest job only reads notifications that still need an email.
+db.Index(
+    "ix_notifications_pending_email",
+    Notification.user_id,
+    Notification.id,
+    sqlite_where=Notification.emailed_at.is_(None),
+    postgresql_where=Notification.emailed_at.is_(None),
+)
+
+
+class Tombstone(SyncRevisionMixin, db.Model):
+    """Marks a deleted row so delta sync clients can drop their copy.
+
+    Rows scoped to a project (``user_id`` unset) are shown to whoever can
+    still see the project. ``user_id`` addresses a single user, e.g. when a
+    whole project disappears and project visibility can no longer be checked.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        db.Index("ix_tombstones_project_sync", "project_id", "sync_rev"),
+        db.Index("ix_tombstones_user_sync", "user_id", "sync_rev"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(Enum(SyncEntity), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    # No foreign keys: tombstones outlive the rows they point at.
+    project_id = db.Column(db.Integer)
+    user_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+# The pre-commit stamp only touches rows its own transaction wrote.
+for _synced in (Project, Task, Membership, Notification, Tombstone):
+    db.Index(
+        f"ix_{_synced.__tablename__}_sync_pending",
+        _synced.id,
+        sqlite_where=_synced.sync_rev.is_(None),
+        postgresql_where=_synced.sync_rev.is_(None),
+    )
+del _synced
+
+
+class SyncState(db.Model):
+    """The single row behind delta sync cursors.
+
+    ``revision`` goes up by one for every committed write. The transaction
+    holds this row's lock until it commits, so revisions follow commit order.
+    ``pruned_revision`` is the newest revision whose tombstones were pruned;
+    cursors older than that must resync in full.
+    """
+
+    __tablename__ = "sync_state"
+
+    id = db.Column(db.Integer, primary_key=True)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    pruned_revision = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+
+class ActivityLog(db.Model):
+    """Append-only task history, written in batches by app.projects.activity.
+
+    ``bucket`` is the UTC month (``YYYYMM``) of the entry; retention drops whole
+    buckets through its index, and maps onto monthly partitions on PostgreSQL.
+    """
+
+    __tablename__ = "activity_log"
+    __table_args__ = (db.Index("ix_activity_log_project_id", "project_id", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    # No foreign key: history outlives the task it describes.
+    task_id = db.Column(db.Integer)
+    task_title = db.Column(db.String(150), nullable=False)
+    actor_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    action = db.Column(Enum(ActivityAction), nullable=False)
+    changes = db.Column(db.JSON, nullable=False, default=dict)
+    bucket = db.Column(db.Integer, nullable=False, index=True)
+    # Indexed for the daily rollup, which reads one day's entries at a time.
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class ProjectDailyStats(db.Model):
+    """End-of-day task counts and status transitions of one project.
+
+    Written by app.projects.analytics only for UTC days with activity; charts
+    carry the counts forward across days without a row.
+    """
+
+    __tablename__ = "project_daily_stats"
+
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = db.Column(db.Date, primary_key=True)
+    todo = db.Column(db.Integer, nullable=False, default=0)
+    in_progress = db.Column(db.Integer, nullable=False, default=0)
+    done = db.Column(db.Integer, nullable=False, default=0)
+    added = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    reopened = db.Column(db.Integer, nullable=False, default=0)
+    removed = db.Column(db.Integer, nullable=False, default=0)
+
+
 __all__ = [
     "User",
     "OTPToken",
@@ -226,10 +502,19 @@ __all__ = [
     "Role",
     "Task",
     "TaskStatus",
+    "RecurrenceFrequency",
     "task_members",
+    "task_dependencies",
     "Invitation",
     "InvitationStatus",
     "Notification",
     "NotificationType",
+    "NotificationDelivery",
+    "ActivityAction",
+    "ActivityLog",
+    "ProjectDailyStats",
+    "SyncEntity",
+    "SyncState",
+    "Tombstone",
 ]
 
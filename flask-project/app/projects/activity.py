@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import enum
+from datetime import date, datetime
+
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import delete, event, inspect, insert, select
+
+from ..extensions import db
+from ..models import ActivityAction, ActivityLog, Task, TaskStatus, User
+
+TRACKED_FIELDS = ("title", "description", "status", "due_date", "assigned_to_id", "recurrence_freq")
+
+
+def activity_bucket(moment: datetime) -> int:
+    return moment.year * 100 + moment.month
+
+
+def _jsonable(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _actor_id() -> int | None:
+    if has_request_context() and current_user.is_authenticated:
+        return current_user.id
+    return None
+
+
+def _task_changes(task: Task) -> dict[str, list]:
+    changes = {}
+    state = inspect(task)
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            changes[field] = [_jsonable(old), _jsonable(new)]
+    return changes
+
+
+def _collect_activity(session, flush_context, instances) -> None:
+    """Buffer one entry per task change; rows are written at commit time."""
+    buffer = session.info.setdefault("activity_buffer", [])
+    actor_id = _actor_id()
+
+    # Creates and deletes carry the status too, so the log is a complete
+    # record of status transitions (see app.projects.analytics).
+    for obj in session.new:
+        if isinstance(obj, Task):
+            status = _jsonable(obj.status or TaskStatus.TODO)
+            buffer.append((obj, ActivityAction.CREATED, {"status": [None, status]}, actor_id))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            status = _jsonable(obj.status)
+            buffer.append((obj, ActivityAction.DELETED, {"status": [status, None]}, actor_id))
+    for obj in session.dirty:
+        if not isinstance(obj, Task) or obj in session.deleted:
+            continue
+        changes = _task_changes(obj)
+        if changes:
+            action = ActivityAction.MOVED if changes.keys() == {"status"} else ActivityAction.UPDATED
+            buffer.append((obj, action, changes, actor_id))
+
+
+def _write_activity(session) -> None:
+    """Append the buffered entries in one executemany INSERT before commit."""
+    # Flush first so new tasks have ids and changes still pending in the
+    # session are buffered too; commit's own flush runs after this hook.
+    session.flush()
+    buffer = session.info.pop("activity_buffer", None)
+    if not buffer:
+        return
+
+    now = datetime.utcnow()
+    bucket = activity_bucket(now)
+    rows = [
+        {
+            "project_id": task.project_id,
+            "task_id": task.id,
+            "task_title": task.title,
+            "actor_id": actor_id,
+            "action": action,
+            "changes": changes,
+            "bucket": bucket,
+            "created_at": now,
+        }
+        for task, action, changes, actor_id in buffer
+    ]
+    session.connection().execute(insert(ActivityLog.__table__), rows)
+
+
+def record_created(tasks) -> None:
+    """Log tasks inserted with Core statements, which bypass the flush listeners.
+
+    ``tasks`` are rows with ``id``, ``project_id``, ``title`` and ``status``.
+    """
+    if not tasks:
+        return
+    now = datetime.utcnow()
+    db.session.execute(
+        insert(ActivityLog.__table__),
+        [
+            {
+                "project_id": task.project_id,
+                "task_id": task.id,
+                "task_title": task.title,
+                "actor_id": None,
+                "action": ActivityAction.CREATED,
+                "changes": {"status": [None, _jsonable(task.status)]},
+                "bucket": activity_bucket(now),
+                "created_at": now,
+            }
+            for task in tasks
+        ],
+    )
+
+
+def _discard_activity(session, previous_transaction=None) -> None:
+    session.info.pop("activity_buffer", None)
+
+
+def register_activity_listeners() -> None:
+    if not event.contains(db.session, "before_commit", _write_activity):
+        event.listen(db.session, "before_flush", _collect_activity)
+        event.listen(db.session, "before_commit", _write_activity)
+        event.listen(db.session, "after_rollback", _discard_activity)
+
+
+def activity_page(project_id: int, before: int | None, limit: int) -> tuple[list, int | None]:
+    """Newest-first keyset page of a project's activity.
+
+    Seeks on the ``(project_id, id)`` index, so every page costs one short range
+    scan regardless of how much history the project has.
+    """
+    query = (
+        select(
+            ActivityLog.id,
+            ActivityLog.task_id,
+            ActivityLog.task_title,
+            ActivityLog.action,
+            ActivityLog.changes,
+            ActivityLog.created_at,
+            ActivityLog.actor_id,
+            User.name.label("actor_name"),
+        )
+        .outerjoin(User, User.id == ActivityLog.actor_id)
+        .where(ActivityLog.project_id == project_id)
+    )
+    if before is not None:
+        query = query.where(ActivityLog.id < before)
+    rows = db.session.execute(query.order_by(ActivityLog.id.desc()).limit(limit + 1)).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def prune_activity(keep_months: int, now: datetime | None = None) -> int:
+    """Drop whole monthly buckets older than ``keep_months`` and return the row count."""
+    now = now or datetime.utcnow()
+    month_index = now.year * 12 + now.month - 1 - keep_months
+    cutoff = (month_index // 12) * 100 + month_index % 12 + 1
+    result = db.session.execute(delete(ActivityLog).where(ActivityLog.bucket < cutoff))
+    db.session.commit()
+    return result.rowcount
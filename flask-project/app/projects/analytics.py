@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import delete, insert, select, tuple_
+
+from ..extensions import db
+from ..models import ActivityLog, Project, ProjectDailyStats, TaskStatus
+from .counters import verify_counters
+
+STATUS_COLUMNS = {
+    TaskStatus.TODO.value: "todo",
+    TaskStatus.IN_PROGRESS.value: "in_progress",
+    TaskStatus.DONE.value: "done",
+}
+FLOW_COLUMNS = ("added", "completed", "reopened", "removed")
+
+
+class DayStats(NamedTuple):
+    day: date
+    todo: int
+    in_progress: int
+    done: int
+    added: int = 0
+    completed: int = 0
+    reopened: int = 0
+    removed: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.todo + self.in_progress
+
+    @property
+    def scope(self) -> int:
+        return self.todo + self.in_progress + self.done
+
+
+def _transition(changes: dict | None) -> tuple[str | None, str | None] | None:
+    # Creates and deletes logged before they carried a status have none here.
+    status = (changes or {}).get("status")
+    return (status[0], status[1]) if status else None
+
+
+def roll_up(first: date, last: date | None = None) -> int:
+    """Rebuild the stats rows of every day from ``first`` through ``last``.
+
+    Only activity logged since ``first`` is read. Counts start from the live
+    per-project counters and are walked back entry by entry, newest first,
+    so every row is exact on its own instead of building on the previous
+    day's. The counters are checked against the tasks table first, since any
+    drift would be copied into every row. Projects without activity on a day
+    get no row for it. Re-running a day replaces its rows. Returns the number
+    of rows written.
+    """
+    last = last or first
+    window = ActivityLog.created_at >= datetime.combine(first, time.min)
+    project_ids = db.session.scalars(select(ActivityLog.project_id).where(window).distinct()).all()
+    if not project_ids:
+        return 0
+    verify_counters(project_ids, repair=True)
+    counts = {
+        row.id: {"todo": row.tasks_todo, "in_progress": row.tasks_in_progress, "done": row.tasks_done}
+        for row in db.session.execute(
+            select(Project.id, Project.tasks_todo, Project.tasks_in_progress, Project.tasks_done).where(
+                Project.id.in_(project_ids), Project.deleted_at.is_(None)
+            )
+        )
+    }
+
+    stats: dict[tuple[int, date], dict[str, int]] = {}
+    entries = db.session.execute(
+        select(ActivityLog.project_id, ActivityLog.changes, ActivityLog.created_at)
+        .where(window)
+        .order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+        .execution_options(yield_per=1000)
+    )
+    for entry in entries:
+        current = counts.get(entry.project_id)
+        if current is None:
+            continue
+        key = (entry.project_id, entry.created_at.date())
+        row = stats.get(key)
+        if row is None and first <= key[1] <= last:
+            # Everything later has been undone, so these are end-of-day counts.
+            row = stats[key] = {**current, **dict.fromkeys(FLOW_COLUMNS, 0)}
+
+        transition = _transition(entry.changes)
+        if transition is None:
+            continue
+        old, new = transition
+        if new is not None:
+            current[STATUS_COLUMNS[new]] -= 1
+        if old is not None:
+            current[STATUS_COLUMNS[old]] += 1
+        if row is not None:
+            if old is None:
+                row["added"] += 1
+            elif new is None:
+                row["removed"] += 1
+            elif new == TaskStatus.DONE.value:
+                row["completed"] += 1
+            elif old == TaskStatus.DONE.value:
+                row["reopened"] += 1
+
+    if stats:
+        db.session.execute(
+            delete(ProjectDailyStats).where(
+                tuple_(ProjectDailyStats.project_id, ProjectDailyStats.day).in_(list(stats))
+            )
+        )
+        db.session.execute(
+            insert(ProjectDailyStats),
+            [{"project_id": project_id, "day": day, **row} for (project_id, day), row in stats.items()],
+        )
+    db.session.commit()
+    return len(stats)
+
+
+def daily_series(project_id: int, days: int, today: date | None = None) -> list[DayStats]:
+    """One point per day for the ``days`` days up to yesterday.
+
+    Reads at most ``days + 1`` rows: those in range plus the last one before
+    it, whose counts carry forward into the first days without a row. Days
+    before the project's first row are left out.
+    """
+    end = (today or datetime.utcnow().date()) - timedelta(days=1)
+    start = end - timedelta(days=days - 1)
+    columns = (
+        ProjectDailyStats.day,
+        ProjectDailyStats.todo,
+        ProjectDailyStats.in_progress,
+        ProjectDailyStats.done,
+        *(getattr(ProjectDailyStats, column) for column in FLOW_COLUMNS),
+    )
+    seed = db.session.execute(
+        select(*columns)
+        .where(ProjectDailyStats.project_id == project_id, ProjectDailyStats.day < start)
+        .order_by(ProjectDailyStats.day.desc())
+        .limit(1)
+    ).first()
+    rows = {
+        row.day: DayStats(*row)
+        for row in db.session.execute(
+            select(*columns).where(
+                ProjectDailyStats.project_id == project_id,
+                ProjectDailyStats.day.between(start, end),
+            )
+        )
+    }
+
+    series = []
+    previous = DayStats(*seed) if seed else None
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        point = rows.get(day)
+        if point is None and previous is not None:
+            point = DayStats(day, previous.todo, previous.in_progress, previous.done)
+        if point is not None:
+            series.append(point)
+            previous = point
+    return series
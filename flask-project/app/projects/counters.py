@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm.util import identity_key
+
+from ..extensions import db
+from ..models import Project, Task, TaskStatus
+
+COUNTER_COLUMNS = {
+    TaskStatus.TODO: "tasks_todo",
+    TaskStatus.IN_PROGRESS: "tasks_in_progress",
+    TaskStatus.DONE: "tasks_done",
+}
+
+
+def _task_deltas(session) -> dict[int, dict[str, int]]:
+    deltas: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    for obj in session.new:
+        if isinstance(obj, Task) and obj.project_id is not None:
+            deltas[obj.project_id]["tasks_total"] += 1
+            deltas[obj.project_id][COUNTER_COLUMNS[TaskStatus(obj.status or TaskStatus.TODO)]] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deltas[obj.project_id]["tasks_total"] -= 1
+            deltas[obj.project_id][COUNTER_COLUMNS[TaskStatus(obj.status)]] -= 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, Task):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes() or not history.deleted:
+            continue
+        old, new = TaskStatus(history.deleted[0]), TaskStatus(history.added[0])
+        if old != new:
+            deltas[obj.project_id][COUNTER_COLUMNS[old]] -= 1
+            deltas[obj.project_id][COUNTER_COLUMNS[new]] += 1
+
+    return deltas
+
+
+def _collect_counter_deltas(session, flush_context, instances) -> None:
+    # Read before the flush: deleted rows can no longer be loaded afterwards.
+    session.info["pending_counter_deltas"] = _task_deltas(session)
+
+
+def _apply_counter_deltas(session, flush_context) -> None:
+    """Fold this flush's task inserts, deletes and status moves into the counters.
+
+    Runs inside the flush transaction, so counters commit or roll back
+    together with the task rows that changed them.
+    """
+    deltas = session.info.pop("pending_counter_deltas", {})
+    connection = session.connection()
+    for project_id, changes in deltas.items():
+        values = {
+            column: getattr(Project, column) + amount
+            for column, amount in changes.items()
+            if amount
+        }
+        if values:
+            connection.execute(update(Project).where(Project.id == project_id).values(**values))
+    session.info.setdefault("stale_counter_projects", set()).update(deltas)
+
+
+def _expire_counters(session, flush_context) -> None:
+    for project_id in session.info.pop("stale_counter_projects", ()):
+        project = session.identity_map.get(identity_key(Project, project_id))
+        if project is not None:
+            session.expire(project, ["tasks_total", *COUNTER_COLUMNS.values()])
+
+
+def register_counter_listeners() -> None:
+    if not event.contains(db.session, "after_flush", _apply_counter_deltas):
+        event.listen(db.session, "before_flush", _collect_counter_deltas)
+        event.listen(db.session, "after_flush", _apply_counter_deltas)
+        event.listen(db.session, "after_flush_postexec", _expire_counters)
+
+
+def verify_counters(project_ids: list[int] | None = None, repair: bool = False) -> list[dict]:
+    """Recompute counters with one grouped scan and return the projects that drifted.
+
+    With ``repair`` the drifted rows are fixed in a single executemany UPDATE.
+    """
+    counts_query = select(Task.project_id, Task.status, func.count(Task.id)).group_by(
+        Task.project_id, Task.status
+    )
+    projects_query = select(
+        Project.id, Project.tasks_total, *(getattr(Project, c) for c in COUNTER_COLUMNS.values())
+    )
+    if project_ids is not None:
+        counts_query = counts_query.where(Task.project_id.in_(project_ids))
+        projects_query = projects_query.where(Project.id.in_(project_ids))
+
+    actual: dict[int, dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS.values(), 0))
+    for project_id, status, count in db.session.execute(counts_query):
+        actual[project_id][COUNTER_COLUMNS[status]] = count
+
+    drifted = []
+    for row in db.session.execute(projects_query).mappings():
+        expected = dict(actual[row["id"]])
+        expected["tasks_total"] = sum(expected.values())
+        if any(row[column] != value for column, value in expected.items()):
+            drifted.append({"id": row["id"], **expected})
+
+    if repair and drifted:
+        db.session.execute(update(Project), drifted)
+        db.session.commit()
+    return drifted
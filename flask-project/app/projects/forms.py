@@ -1,10 +1,19 @@
 ﻿from __future__ import annotations
 
 from flask_wtf import FlaskForm
-from wtforms import DateTimeLocalField, SelectField, StringField, SubmitField, TextAreaField
-from wtforms.validators import DataRequired, Email, Length, Optional
+from flask_wtf.file import FileAllowed, FileField
+from wtforms import (
+    DateTimeLocalField,
+    IntegerField,
+    SelectField,
+    StringField,
+    SubmitField,
+    TextAreaField,
+)
+from wtforms.validators import DataRequired, Email, Length, NumberRange, Optional, ValidationError
+from wtforms.widgets import HiddenInput
 
-from ..models import TaskStatus
+from ..models import RecurrenceFrequency, TaskStatus
 
 
 class ProjectForm(FlaskForm):
@@ -18,6 +27,12 @@ class InviteMemberForm(FlaskForm):
     submit = SubmitField("Invite")
 
 
+class BulkInviteForm(FlaskForm):
+    emails = TextAreaField("Member Emails", validators=[Optional(), Length(max=50000)])
+    csv_file = FileField("CSV File", validators=[Optional(), FileAllowed(["csv", "txt"])])
+    submit = SubmitField("Invite All")
+
+
 class TaskForm(FlaskForm):
     title = StringField("Task Title", validators=[DataRequired(), Length(max=150)])
     description = TextAreaField("Details", validators=[Length(max=1000)])
@@ -30,10 +45,30 @@ class TaskForm(FlaskForm):
         default=TaskStatus.TODO.value,
     )
     assignee_id = SelectField("Assign To", choices=[], coerce=int, default=0)
+    recurrence = SelectField(
+        "Repeat",
+        choices=[("", "Does not repeat"), *((freq.value, freq.name.title()) for freq in RecurrenceFrequency)],
+        default="",
+    )
+    recurrence_interval = IntegerField(
+        "Every", validators=[Optional(), NumberRange(min=1, max=365)], default=1
+    )
+    recurrence_until = DateTimeLocalField(
+        "Repeat Until", format="%Y-%m-%dT%H:%M", validators=[Optional()], default=None
+    )
+    recurrence_count = IntegerField(
+        "Occurrences", validators=[Optional(), NumberRange(min=1, max=1000)], default=None
+    )
+    # The version the edit started from; a mismatch means someone saved first.
+    version = IntegerField(widget=HiddenInput(), validators=[Optional()])
     submit = SubmitField("Save Task")
 
+    def validate_recurrence(self, field) -> None:
+        if field.data and not self.due_date.data:
+            raise ValidationError("Repeating tasks need a due date.")
+
     def set_assignee_choices(self, members: list[tuple[int, str]]) -> None:
         self.assignee_id.choices = [(0, "Unassigned"), *members]
 
 
-__all__ = ["ProjectForm", "InviteMemberForm", "TaskForm"]
+__all__ = ["ProjectForm", "InviteMemberForm", "BulkInviteForm", "TaskForm"]
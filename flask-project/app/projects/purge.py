@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from flask import Flask
+from sqlalchemy import delete, func, select
+
+from ..extensions import db
+from ..models import (
+    ActivityLog,
+    Invitation,
+    Membership,
+    Notification,
+    Project,
+    ProjectDailyStats,
+    Task,
+    task_dependencies,
+    task_members,
+)
+from ..sync.changes import record_notifications_removed
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeProgress:
+    project_id: int
+    requested_by: int | None = None
+    state: str = "pending"
+    total_tasks: int = 0
+    deleted_tasks: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+_jobs: dict[str, PurgeProgress] = {}
+_jobs_lock = threading.Lock()
+
+
+def purge_project(
+    project_id: int,
+    batch_size: int = 1000,
+    on_progress: Callable[[PurgeProgress], None] | None = None,
+) -> PurgeProgress:
+    """Hard-delete a project and everything under it with set-based DELETEs.
+
+    Tasks go in ``batch_size`` id batches, each in its own short transaction,
+    so no row is loaded into the session and writers are never blocked for
+    long. Re-running after a failure resumes where the last batch stopped.
+    """
+    progress = PurgeProgress(project_id=project_id, state="running")
+    progress.total_tasks = db.session.scalar(
+        select(func.count(Task.id)).where(Task.project_id == project_id)
+    )
+    if on_progress:
+        on_progress(progress)
+
+    db.session.execute(delete(task_dependencies).where(task_dependencies.c.project_id == project_id))
+    db.session.commit()
+
+    while True:
+        task_ids = db.session.scalars(
+            select(Task.id).where(Task.project_id == project_id).limit(batch_size)
+        ).all()
+        if not task_ids:
+            break
+        db.session.execute(delete(task_members).where(task_members.c.task_id.in_(task_ids)))
+        db.session.execute(delete(Task).where(Task.id.in_(task_ids)))
+        db.session.commit()
+        progress.deleted_tasks += len(task_ids)
+        if on_progress:
+            on_progress(progress)
+
+    about_project = Notification.payload["project_id"].as_integer() == project_id
+    record_notifications_removed(about_project)
+    db.session.execute(delete(Notification).where(about_project))
+    db.session.execute(delete(ActivityLog).where(ActivityLog.project_id == project_id))
+    db.session.execute(delete(ProjectDailyStats).where(ProjectDailyStats.project_id == project_id))
+    db.session.execute(delete(Invitation).where(Invitation.project_id == project_id))
+    db.session.execute(delete(Membership).where(Membership.project_id == project_id))
+    db.session.execute(delete(Project).where(Project.id == project_id))
+    db.session.commit()
+
+    progress.state = "done"
+    if on_progress:
+        on_progress(progress)
+    return progress
+
+
+def purge_deleted(
+    older_than: timedelta,
+    batch_size: int = 1000,
+    on_progress: Callable[[PurgeProgress], None] | None = None,
+) -> list[int]:
+    """Finish purging projects that are still soft-deleted; return their ids.
+
+    The job started on delete lives in its worker's memory, so a restart
+    leaves the project hidden but half-purged. Only projects deleted more
+    than ``older_than`` ago are picked up, so jobs still running are left
+    alone. A failing project is logged and skipped.
+    """
+    cutoff = datetime.utcnow() - older_than
+    project_ids = db.session.scalars(
+        select(Project.id).where(Project.deleted_at < cutoff).order_by(Project.id)
+    ).all()
+    purged = []
+    for project_id in project_ids:
+        try:
+            purge_project(project_id, batch_size=batch_size, on_progress=on_progress)
+        except Exception:
+            db.session.rollback()
+            logger.exception("Purging project %s failed.", project_id)
+        else:
+            purged.append(project_id)
+    return purged
+
+
+def start_purge(app: Flask, project_id: int, requested_by: int | None = None) -> str:
+    """Run :func:`purge_project` on a background thread and return its job id.
+
+    Progress is kept in process memory and read back with :func:`job_progress`.
+    """
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _jobs[job_id] = PurgeProgress(project_id=project_id, requested_by=requested_by)
+
+    def publish(progress: PurgeProgress) -> None:
+        with _jobs_lock:
+            _jobs[job_id] = PurgeProgress(**{**progress.to_dict(), "requested_by": requested_by})
+
+    def run() -> None:
+        with app.app_context():
+            try:
+                purge_project(
+                    project_id,
+                    batch_size=app.config.get("PROJECT_PURGE_BATCH_SIZE", 1000),
+                    on_progress=publish,
+                )
+            except Exception as exc:  # surfaced through job_progress
+                db.session.rollback()
+                logger.exception("Purging project %s failed.", project_id)
+                with _jobs_lock:
+                    _jobs[job_id].state = "failed"
+                    _jobs[job_id].error = str(exc)
+
+    threading.Thread(target=run, name=f"purge-project-{project_id}", daemon=True).start()
+    return job_id
+
+
+def job_progress(job_id: str) -> PurgeProgress | None:
+    with _jobs_lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import calendar
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from ..extensions import db
+from ..models import Project, RecurrenceFrequency, Task, TaskStatus, task_members
+from .activity import record_created
+from .counters import verify_counters
+from .schedule import bump_schedule
+
+
+def advance(
+    due: datetime, freq: RecurrenceFrequency, interval: int = 1, anchor_day: int | None = None
+) -> datetime:
+    """Return the occurrence ``interval`` periods after ``due``.
+
+    Monthly steps clamp to the last day of shorter months; pass the series'
+    original day as ``anchor_day`` so Jan 31 -> Feb 28 -> Mar 31.
+    """
+    if freq == RecurrenceFrequency.DAILY:
+        return due + timedelta(days=interval)
+    if freq == RecurrenceFrequency.WEEKLY:
+        return due + timedelta(weeks=interval)
+    month_index = due.month - 1 + interval
+    year, month = due.year + month_index // 12, month_index % 12 + 1
+    day = min(anchor_day or due.day, calendar.monthrange(year, month)[1])
+    return due.replace(year=year, month=month, day=day)
+
+
+def _plan(series, horizon: datetime) -> tuple[list[datetime], datetime | None]:
+    """Return the slots to create up to ``horizon`` and the series' next cursor.
+
+    ``recurrence_count`` includes the task that defines the series, and a
+    ``None`` cursor marks the series as finished.
+    """
+    slots: list[datetime] = []
+    next_at = series.recurrence_next_at
+    generated = series.recurrence_generated
+    while next_at is not None and next_at <= horizon:
+        slots.append(next_at)
+        generated += 1
+        next_at = advance(next_at, series.recurrence_freq, series.recurrence_interval, series.due_date.day)
+        if series.recurrence_count and generated + 1 >= series.recurrence_count:
+            next_at = None
+        elif series.recurrence_until and next_at > series.recurrence_until:
+            next_at = None
+    return slots, next_at
+
+
+def schedule_series(task: Task) -> None:
+    """(Re)arm ``task``'s series after its rule or due date changed.
+
+    The next slot is the first one after the task's own due date, the latest
+    instance already created and the current time, so saving the task again
+    never backfills or duplicates a slot.
+    """
+    if task.recurrence_freq is None or task.due_date is None:
+        task.recurrence_next_at = None
+        return
+
+    latest = task.due_date
+    if task.id is not None:
+        last_instance = db.session.scalar(
+            select(Task.due_date)
+            .where(Task.recurrence_parent_id == task.id)
+            .order_by(Task.due_date.desc())
+            .limit(1)
+        )
+        latest = max(latest, last_instance or latest)
+
+    # A series saved with a past due date starts today rather than backfilling.
+    floor = max(latest, datetime.utcnow())
+    next_at, steps = task.due_date, 0
+    while next_at <= floor:
+        steps += 1
+        next_at = advance(task.due_date, task.recurrence_freq, task.recurrence_interval * steps)
+
+    finished = (task.recurrence_until and next_at > task.recurrence_until) or (
+        task.recurrence_count and (task.recurrence_generated or 0) + 1 >= task.recurrence_count
+    )
+    task.recurrence_next_at = None if finished else next_at
+
+
+def _slot_insert(dialect: str):
+    """INSERT that silently skips slots another run already filled.
+
+    Only the rows actually inserted come back from ``RETURNING``.
+    """
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:  # pragma: no cover - other backends rely on the unique constraint alone
+        dialect_insert = None
+
+    if dialect_insert is None:
+        stmt = insert(Task.__table__)
+    else:
+        stmt = dialect_insert(Task.__table__).on_conflict_do_nothing(
+            index_elements=["recurrence_parent_id", "due_date"]
+        )
+    return stmt.returning(Task.id, Task.project_id, Task.title, Task.status)
+
+
+def materialize_due(now: datetime | None = None, horizon_days: int = 14, batch_size: int = 500) -> int:
+    """One scheduler tick: create every instance due within the horizon.
+
+    Only series whose ``recurrence_next_at`` falls inside the window are read,
+    via its index. Series in archived or deleted projects wait; once the
+    project is restored they pick up from ``recurrence_next_at``. Each batch is one multi-row INSERT across all projects,
+    followed by a compare-and-set on ``recurrence_next_at``. If two ticks race,
+    the loser's inserts hit the unique slot and its cursor update matches no
+    row, so running the tick again or concurrently never duplicates tasks.
+    Returns the number of tasks created.
+    """
+    now = now or datetime.utcnow()
+    horizon = now + timedelta(days=horizon_days)
+    dialect = db.engine.dialect.name
+    created = 0
+    last_id = 0
+
+    while True:
+        batch = db.session.execute(
+            select(
+                Task.id,
+                Task.project_id,
+                Task.title,
+                Task.description,
+                Task.due_date,
+                Task.created_by_id,
+                Task.assigned_to_id,
+                Task.recurrence_freq,
+                Task.recurrence_interval,
+                Task.recurrence_until,
+                Task.recurrence_count,
+                Task.recurrence_generated,
+                Task.recurrence_next_at,
+            )
+            .join(Project, Project.id == Task.project_id)
+            .where(
+                Project.active_filter(),
+                Task.recurrence_freq.isnot(None),
+                Task.recurrence_next_at <= horizon,
+                Task.id > last_id,
+            )
+            .order_by(Task.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        rows, advanced = [], []
+        for series in batch:
+            slots, next_at = _plan(series, horizon)
+            rows.extend(
+                {
+                    "project_id": series.project_id,
+                    "title": series.title,
+                    "description": series.description,
+                    "due_date": slot,
+                    "status": TaskStatus.TODO,
+                    "created_by_id": series.created_by_id,
+                    "assigned_to_id": series.assigned_to_id,
+                    "recurrence_parent_id": series.id,
+                }
+                for slot in slots
+            )
+            advanced.append((series, series.recurrence_generated + len(slots), next_at))
+
+        inserted = []
+        if rows:
+            inserted = db.session.connection().execute(_slot_insert(dialect), rows).all()
+            record_created(inserted)
+            created += len(inserted)
+
+        claimed_projects = set()
+        for series, generated, next_at in advanced:
+            result = db.session.execute(
+                update(Task)
+                .where(Task.id == series.id, Task.recurrence_next_at == series.recurrence_next_at)
+                .values(recurrence_generated=generated, recurrence_next_at=next_at)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                claimed_projects.add(series.project_id)
+
+        # Copy the series' assignees onto the instances created just now only;
+        # older instances keep whatever their members changed them to. Plain
+        # rows, not INSERT ... SELECT, so the sync listener sees the task ids.
+        links = []
+        if inserted:
+            links = db.session.execute(
+                select(Task.id.label("task_id"), task_members.c.user_id)
+                .join(task_members, task_members.c.task_id == Task.recurrence_parent_id)
+                .where(Task.id.in_([row.id for row in inserted]))
+            ).mappings().all()
+        if links:
+            db.session.execute(insert(task_members), [dict(link) for link in links])
+        # Core inserts skip the ORM listeners; new instances change the schedule.
+        bump_schedule(*sorted(claimed_projects))
+        db.session.commit()
+        if claimed_projects:
+            verify_counters(sorted(claimed_projects), repair=True)
+
+    return created
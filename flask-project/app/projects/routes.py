@@ -1,18 +1,28 @@
 ﻿from __future__ import annotations
 
-from datetime import datetime
+import csv
+import io
+import re
+from datetime import date, datetime, timedelta
 
+import click
 from flask import (
     Blueprint,
     abort,
+    current_app,
     flash,
+    get_flashed_messages,
     jsonify,
     redirect,
-    render_template,
     request,
+    stream_template,
+    stream_with_context,
     url_for,
 )
 from flask_login import current_user, login_required
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm.exc import StaleDataError
 
 from ..extensions import db
 from ..models import (
@@ -21,14 +31,25 @@ from ..models import (
     Membership,
     Notification,
     Project,
+    RecurrenceFrequency,
     Role,
     Task,
     TaskStatus,
     User,
 )
-from ..utils.email import send_email
-from ..utils.notifications import notify_invitation
-from .forms import InviteMemberForm, ProjectForm, TaskForm
+from ..read_models import MemberRow, project_members, task_cards
+from ..sync.changes import record_project_removed, touch_memberships
+from ..utils.email import send_bulk_email, send_email
+from ..utils.notifications import notify_invitation, notify_invitations, wants_instant_email
+from ..utils.transactions import unit_of_work
+from .activity import activity_page, prune_activity
+from .analytics import daily_series, roll_up
+from .counters import verify_counters
+from .forms import BulkInviteForm, InviteMemberForm, ProjectForm, TaskForm
+from .purge import job_progress, purge_deleted, purge_project, start_purge
+from .recurrence import materialize_due, schedule_series
+from .schedule import DependencyError, add_dependency, get_schedule, remove_dependency
+from .transfer import export_csv, export_ndjson, import_project
 
 
 projects_bp = Blueprint("projects", __name__, url_prefix="/projects")
@@ -40,19 +61,62 @@ def _membership_for_current_user(project_id: int) -> Membership | None:
     ).first()
 
 
-def _collect_members(project: Project):
-    memberships = project.memberships.filter_by(is_active=True).all()
-    members = {project.owner.id: project.owner}
-    for membership in memberships:
-        members[membership.user.id] = membership.user
-    return members
+def _load_project(project_id: int) -> Project:
+    """Fetch a project, hiding deleted ones and archived ones from non-owners."""
+    project = db.session.get(Project, project_id)
+    if project is None or project.deleted_at is not None:
+        abort(404)
+    if project.archived_at is not None and project.owner_id != current_user.id:
+        abort(404)
+    return project
+
+
+def _collect_members(project: Project) -> dict[int, MemberRow]:
+    return project_members(project.id, project.owner_id)
+
+
+def _wants_json() -> bool:
+    return bool(
+        request.accept_mimetypes.accept_json
+        and request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    )
+
+
+def _task_state(task: Task) -> dict[str, object]:
+    """A task as the board's edit form sees it; sent back with conflicts."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description or "",
+        "status": task.status.value,
+        "assignee_id": task.assigned_to_id or 0,
+        "due_date": task.due_date.strftime("%Y-%m-%dT%H:%M") if task.due_date else "",
+        "recurrence": task.recurrence_freq.value if task.recurrence_freq else "",
+        "recurrence_interval": task.recurrence_interval or 1,
+        "recurrence_until": (
+            task.recurrence_until.strftime("%Y-%m-%dT%H:%M") if task.recurrence_until else ""
+        ),
+        "recurrence_count": task.recurrence_count or "",
+        "version": task.version,
+    }
+
+
+def _task_conflict(project_id: int, task_id: int):
+    """Answer a lost update with the task's current state (409) or a flash."""
+    db.session.rollback()
+    task = Task.query.filter_by(id=task_id, project_id=project_id).first_or_404()
+    message = "Someone else changed this task. Review the latest version and try again."
+    if _wants_json() or request.is_json:
+        return jsonify(error="conflict", message=message, task=_task_state(task)), 409
+    flash(message, "warning")
+    return redirect(url_for("projects.detail", project_id=project_id))
 
 
 @projects_bp.route("/create", methods=["POST"])
 @login_required
 def create_project():
     form = ProjectForm()
-    wants_json = request.accept_mimetypes.accept_json and request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    wants_json = _wants_json()
 
     if form.validate_on_submit():
         project = Project(
@@ -93,7 +157,7 @@ def create_project():
 @projects_bp.route("/<int:project_id>")
 @login_required
 def detail(project_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     membership = _membership_for_current_user(project_id)
     is_owner = project.owner_id == current_user.id
     if not is_owner and not membership:
@@ -103,23 +167,67 @@ def detail(project_id: int):
     members, assign_options, _ = _prepare_task_form(task_form, project, is_owner)
 
     invite_form = InviteMemberForm()
+    bulk_invite_form = BulkInviteForm()
+
+    status_counts = {
+        TaskStatus.TODO.value: project.tasks_todo,
+        TaskStatus.IN_PROGRESS.value: project.tasks_in_progress,
+        TaskStatus.DONE.value: project.tasks_done,
+    }
+    summary = {
+        "total": project.tasks_total,
+        "done": project.tasks_done,
+        "active": project.tasks_total - project.tasks_done,
+    }
+
+    def column_tasks(status_value: str):
+        # Queried lazily per column so the page header is already on the wire.
+        return task_cards(
+            project_id,
+            TaskStatus(status_value),
+            members,
+            current_app.config.get("BOARD_STREAM_BATCH", 500),
+        )
 
-    tasks = (
-        Task.query.filter_by(project_id=project_id)
-        .order_by(Task.due_date.asc().nulls_last(), Task.created_at.asc())
-        .all()
-    )
-
-    return render_template(
+    # Anything that writes the session must run before headers are sent.
+    get_flashed_messages(with_categories=True)
+    generate_csrf()
+    chunks = stream_template(
         "projects/detail.html",
         project=project,
-        tasks=tasks,
+        summary=summary,
+        status_counts=status_counts,
+        column_tasks=column_tasks,
         task_form=task_form,
         invite_form=invite_form,
+        bulk_invite_form=bulk_invite_form,
         is_owner=is_owner,
         members=members,
         assign_options=assign_options,
     )
+    return current_app.response_class(
+        _coalesce_chunks(chunks, current_app.config.get("BOARD_STREAM_CHUNK_SIZE", 8192))
+    )
+
+
+def _coalesce_chunks(chunks, size: int):
+    """Join Jinja's tiny per-node chunks into ``size``-character writes."""
+    buffer: list[str] = []
+    pending = 0
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            pending += len(chunk)
+            if pending >= size:
+                yield "".join(buffer)
+                buffer.clear()
+                pending = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
 
 
 def _parse_due_date(form: TaskForm) -> datetime | None:
@@ -131,6 +239,15 @@ def _parse_due_date(form: TaskForm) -> datetime | None:
     return form.due_date.data or None
 
 
+def _apply_recurrence(task: Task, form: TaskForm) -> None:
+    freq = form.recurrence.data
+    task.recurrence_freq = RecurrenceFrequency(freq) if freq else None
+    task.recurrence_interval = form.recurrence_interval.data or 1
+    task.recurrence_until = form.recurrence_until.data or None
+    task.recurrence_count = form.recurrence_count.data or None
+    schedule_series(task)
+
+
 def _prepare_task_form(
     task_form: TaskForm,
     project: Project,
@@ -167,7 +284,7 @@ def _prepare_task_form(
 @projects_bp.route("/<int:project_id>/tasks", methods=["POST"])
 @login_required
 def create_task(project_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     membership = _membership_for_current_user(project_id)
     is_owner = project.owner_id == current_user.id
     if not is_owner and not membership:
@@ -194,6 +311,7 @@ def create_task(project_id: int):
             assigned_to_id=assignee.id if assignee else None,
         )
         task.assignees = [assignee] if assignee else []
+        _apply_recurrence(task, task_form)
         db.session.add(task)
         db.session.commit()
         flash("Task created.", "success")
@@ -206,7 +324,7 @@ def create_task(project_id: int):
 @projects_bp.route("/<int:project_id>/tasks/<int:task_id>", methods=["POST"])
 @login_required
 def update_task(project_id: int, task_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     membership = _membership_for_current_user(project_id)
     is_owner = project.owner_id == current_user.id
     if not is_owner and not membership:
@@ -223,13 +341,14 @@ def update_task(project_id: int, task_id: int):
             flash("Members can only assign tasks to themselves.", "danger")
             return redirect(url_for("projects.detail", project_id=project_id))
 
-        current_access_ids = {user.id for user in task.assignees}
-        if not current_access_ids and task.assigned_to_id:
-            current_access_ids = {task.assigned_to_id}
-        if not is_owner and task.created_by_id != current_user.id and current_user.id not in current_access_ids:
+        if not _may_edit_task(task, is_owner):
             flash("Members can edit only their tasks.", "danger")
             return redirect(url_for("projects.detail", project_id=project_id))
 
+        expected_version = task_form.version.data
+        if expected_version is not None and expected_version != task.version:
+            return _task_conflict(project_id, task_id)
+
         assignee = User.query.get(assignee_id) if assignee_id else None
 
         task.title = task_form.title.data
@@ -238,7 +357,11 @@ def update_task(project_id: int, task_id: int):
         task.status = TaskStatus(task_form.status.data)
         task.assignees = [assignee] if assignee else []
         task.assigned_to_id = assignee.id if assignee else None
-        db.session.commit()
+        _apply_recurrence(task, task_form)
+        try:
+            db.session.commit()
+        except StaleDataError:
+            return _task_conflict(project_id, task_id)
         flash("Task updated.", "success")
     else:
         flash("Update failed. Please review the form.", "danger")
@@ -249,7 +372,7 @@ def update_task(project_id: int, task_id: int):
 @projects_bp.route("/<int:project_id>/tasks/<int:task_id>/move", methods=["POST"])
 @login_required
 def move_task(project_id: int, task_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     membership = _membership_for_current_user(project_id)
     is_owner = project.owner_id == current_user.id
     if not is_owner and not membership:
@@ -264,21 +387,172 @@ def move_task(project_id: int, task_id: int):
     except ValueError:
         return {"error": "Invalid status"}, 400
 
+    expected_version = data.get("version")
+    if expected_version is not None:
+        if not isinstance(expected_version, int):
+            return {"error": "Invalid version"}, 400
+        if expected_version != task.version:
+            return _task_conflict(project_id, task_id)
+
     # Allow any active project member to move tasks; ownership already checked above
     task.status = new_status
+    try:
+        db.session.commit()
+    except StaleDataError:
+        return _task_conflict(project_id, task_id)
+    return {"status": task.status.value, "version": task.version}
+
+
+def _may_edit_task(task: Task, is_owner: bool) -> bool:
+    """Owners edit any task; members only those they created or are assigned to."""
+    if is_owner or task.created_by_id == current_user.id:
+        return True
+    access_ids = {user.id for user in task.assignees}
+    if not access_ids and task.assigned_to_id:
+        access_ids = {task.assigned_to_id}
+    return current_user.id in access_ids
+
+
+def _load_editable_task(project_id: int, task_id: int) -> Task:
+    project = _load_project(project_id)
+    is_owner = project.owner_id == current_user.id
+    if not is_owner and not _membership_for_current_user(project_id):
+        abort(403)
+    task = Task.query.filter_by(id=task_id, project_id=project_id).first_or_404()
+    if not _may_edit_task(task, is_owner):
+        abort(403)
+    return task
+
+
+@projects_bp.route("/<int:project_id>/tasks/<int:task_id>/dependencies", methods=["POST"])
+@login_required
+def add_task_dependency(project_id: int, task_id: int):
+    task = _load_editable_task(project_id, task_id)
+    data = request.get_json(silent=True) or request.form
+    try:
+        blocker_id = int(data.get("blocker_id"))
+    except (TypeError, ValueError):
+        return {"error": "Invalid blocker"}, 400
+    blocker = Task.query.filter_by(id=blocker_id, project_id=project_id).first_or_404()
+
+    try:
+        created = add_dependency(task, blocker)
+    except DependencyError as exc:
+        db.session.rollback()
+        return {"error": str(exc)}, 409
     db.session.commit()
-    return {"status": task.status.value}
+    return {"task_id": task.id, "blocker_id": blocker.id}, 201 if created else 200
+
+
+@projects_bp.route(
+    "/<int:project_id>/tasks/<int:task_id>/dependencies/<int:blocker_id>/delete", methods=["POST"]
+)
+@login_required
+def remove_task_dependency(project_id: int, task_id: int, blocker_id: int):
+    _load_editable_task(project_id, task_id)
+    if not remove_dependency(project_id, task_id, blocker_id):
+        abort(404)
+    db.session.commit()
+    return {"task_id": task_id, "blocker_id": blocker_id}
+
+
+@projects_bp.route("/<int:project_id>/schedule")
+@login_required
+def schedule(project_id: int):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id and not _membership_for_current_user(project_id):
+        abort(403)
+
+    result = get_schedule(project_id)
+    critical = set(result.critical_path)
+    return jsonify(
+        revision=result.revision,
+        projected_finish=result.projected_finish.isoformat() if result.projected_finish else None,
+        critical_path=list(result.critical_path),
+        tasks=[
+            {
+                "id": task.id,
+                "title": task.title,
+                "status": task.status.value,
+                "due_date": task.due_date.isoformat() if task.due_date else None,
+                "projected_finish": task.projected_finish.isoformat() if task.projected_finish else None,
+                "slipping": task.is_slipping,
+                "blocked_by": list(task.blocked_by),
+                "driver_id": task.driver_id,
+                "critical": task.id in critical,
+            }
+            for task in result.tasks
+        ],
+    )
+
+
+def _project_series(project_id: int) -> list:
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id and not _membership_for_current_user(project_id):
+        abort(403)
+    max_days = current_app.config.get("ANALYTICS_MAX_DAYS", 365)
+    days = min(max(request.args.get("days", 30, type=int) or 30, 1), max_days)
+    return daily_series(project_id, days)
+
+
+@projects_bp.route("/<int:project_id>/analytics/burndown")
+@login_required
+def burndown(project_id: int):
+    return jsonify(
+        days=[
+            {"day": point.day.isoformat(), "remaining": point.remaining, "scope": point.scope}
+            for point in _project_series(project_id)
+        ]
+    )
+
+
+@projects_bp.route("/<int:project_id>/analytics/flow")
+@login_required
+def cumulative_flow(project_id: int):
+    return jsonify(
+        days=[
+            {
+                "day": point.day.isoformat(),
+                "todo": point.todo,
+                "in_progress": point.in_progress,
+                "done": point.done,
+            }
+            for point in _project_series(project_id)
+        ]
+    )
+
+
+@projects_bp.route("/<int:project_id>/analytics/throughput")
+@login_required
+def throughput(project_id: int):
+    weekly = request.args.get("period") == "week"
+    periods: dict[date, dict[str, int]] = {}
+    for point in _project_series(project_id):
+        start = point.day - timedelta(days=point.day.weekday()) if weekly else point.day
+        bucket = periods.setdefault(start, {"completed": 0, "added": 0, "reopened": 0})
+        bucket["completed"] += point.completed
+        bucket["added"] += point.added
+        bucket["reopened"] += point.reopened
+    return jsonify(
+        period="week" if weekly else "day",
+        periods=[{"start": start.isoformat(), **counts} for start, counts in periods.items()],
+    )
 
 
 @projects_bp.route("/<int:project_id>/tasks/<int:task_id>/delete", methods=["POST"])
 @login_required
 def delete_task(project_id: int, task_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     if project.owner_id != current_user.id:
         flash("Only project owners can delete tasks.", "danger")
         return redirect(url_for("projects.detail", project_id=project_id))
 
     task = Task.query.filter_by(id=task_id, project_id=project_id).first_or_404()
+    # Instances outlive the series that created them; detach them so none is
+    # left pointing at a missing parent (SQLite does not enforce SET NULL).
+    db.session.execute(
+        update(Task).where(Task.recurrence_parent_id == task.id).values(recurrence_parent_id=None)
+    )
     db.session.delete(task)
     db.session.commit()
     flash("Task deleted.", "info")
@@ -288,20 +562,91 @@ def delete_task(project_id: int, task_id: int):
 @projects_bp.route("/<int:project_id>/delete", methods=["POST"])
 @login_required
 def delete_project(project_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     if project.owner_id != current_user.id:
         abort(403)
 
-    db.session.delete(project)
+    # Hide it right away; the rows are removed in the background.
+    project.deleted_at = datetime.utcnow()
+    record_project_removed(project)
     db.session.commit()
+    job_id = start_purge(current_app._get_current_object(), project.id, current_user.id)
+
+    if _wants_json():
+        return jsonify(job_id=job_id, status_url=url_for("projects.purge_status", job_id=job_id)), 202
     flash("Project deleted.", "info")
     return redirect(url_for("dashboard.home"))
 
 
+@projects_bp.route("/purge-jobs/<string:job_id>")
+@login_required
+def purge_status(job_id: str):
+    progress = job_progress(job_id)
+    if progress is None or progress.requested_by != current_user.id:
+        abort(404)
+    return jsonify(progress.to_dict())
+
+
+@projects_bp.route("/<int:project_id>/activity")
+@login_required
+def activity_feed(project_id: int):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id and not _membership_for_current_user(project_id):
+        abort(403)
+
+    max_limit = current_app.config.get("ACTIVITY_PAGE_SIZE", 50)
+    limit = min(request.args.get("limit", max_limit, type=int) or max_limit, max_limit)
+    entries, next_cursor = activity_page(project_id, request.args.get("before", type=int), limit)
+    return jsonify(
+        entries=[
+            {
+                "id": entry.id,
+                "action": entry.action.value,
+                "task_id": entry.task_id,
+                "task_title": entry.task_title,
+                "changes": entry.changes,
+                "actor": {"id": entry.actor_id, "name": entry.actor_name} if entry.actor_id else None,
+                "created_at": entry.created_at.isoformat(),
+            }
+            for entry in entries
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@projects_bp.route("/<int:project_id>/archive", methods=["POST"])
+@login_required
+def archive_project(project_id: int):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id:
+        abort(403)
+
+    project.archived_at = datetime.utcnow()
+    # Members lose sight of archived projects; the owner still syncs them.
+    record_project_removed(project, include_owner=False)
+    db.session.commit()
+    flash("Project archived.", "info")
+    return redirect(url_for("dashboard.home"))
+
+
+@projects_bp.route("/<int:project_id>/restore", methods=["POST"])
+@login_required
+def restore_project(project_id: int):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id:
+        abort(403)
+
+    project.archived_at = None
+    touch_memberships(project)
+    db.session.commit()
+    flash("Project restored.", "success")
+    return redirect(url_for("projects.detail", project_id=project_id))
+
+
 @projects_bp.route("/<int:project_id>/invite", methods=["POST"])
 @login_required
 def invite_member(project_id: int):
-    project = Project.query.get_or_404(project_id)
+    project = _load_project(project_id)
     if project.owner_id != current_user.id:
         abort(403)
 
@@ -334,19 +679,21 @@ def invite_member(project_id: int):
             inviter_id=current_user.id,
             invitee_id=user.id,
         )
-        db.session.add(invitation)
-        db.session.commit()
-
-        notify_invitation(invitation)
-        send_email(
-            subject=f"You've been invited to {project.name}",
-            recipients=[user.email],
-            body=(
-                f"Hello {user.name},\n\n"
-                f"{current_user.name} invited you to collaborate on '{project.name}'.\n"
-                "Visit your dashboard to respond to this invitation."
-            ),
-        )
+        with unit_of_work():
+            db.session.add(invitation)
+            db.session.flush()
+            notify_invitation(invitation)
+
+        if wants_instant_email(user):
+            send_email(
+                subject=f"You've been invited to {project.name}",
+                recipients=[user.email],
+                body=(
+                    f"Hello {user.name},\n\n"
+                    f"{current_user.name} invited you to collaborate on '{project.name}'.\n"
+                    "Visit your dashboard to respond to this invitation."
+                ),
+            )
 
         flash("Invitation sent.", "success")
     else:
@@ -355,6 +702,120 @@ def invite_member(project_id: int):
     return redirect(url_for("projects.detail", project_id=project_id))
 
 
+_EMAIL_SPLIT = re.compile(r"[\s,;]+")
+
+
+def _parse_invite_emails(text: str | None, upload) -> list[str]:
+    chunks = [text or ""]
+    if upload and upload.filename:
+        content = upload.read().decode("utf-8-sig", errors="ignore")
+        chunks.extend(cell for row in csv.reader(io.StringIO(content)) for cell in row)
+
+    emails: dict[str, None] = {}
+    for chunk in chunks:
+        for candidate in _EMAIL_SPLIT.split(chunk):
+            candidate = candidate.strip().strip("\"'<>").lower()
+            if "@" in candidate and len(candidate) <= 120:
+                emails.setdefault(candidate, None)
+    return list(emails)
+
+
+@projects_bp.route("/<int:project_id>/invite/bulk", methods=["POST"])
+@login_required
+def bulk_invite_members(project_id: int):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id:
+        abort(403)
+
+    form = BulkInviteForm()
+    if not form.validate_on_submit():
+        flash("Unable to read the invitation list.", "danger")
+        return redirect(url_for("projects.detail", project_id=project_id))
+
+    emails = _parse_invite_emails(form.emails.data, form.csv_file.data)
+    limit = current_app.config.get("BULK_INVITE_LIMIT", 500)
+    if not emails:
+        flash("Add at least one email address.", "warning")
+        return redirect(url_for("projects.detail", project_id=project_id))
+    if len(emails) > limit:
+        flash(f"You can invite at most {limit} people at once.", "danger")
+        return redirect(url_for("projects.detail", project_id=project_id))
+
+    users = db.session.execute(
+        select(User.id, User.email, User.name, User.notification_delivery).where(
+            User.email.in_(emails)
+        )
+    ).all()
+    user_ids = [user.id for user in users]
+    members = set(
+        db.session.scalars(
+            select(Membership.user_id).where(
+                Membership.project_id == project_id,
+                Membership.is_active.is_(True),
+                Membership.user_id.in_(user_ids),
+            )
+        )
+    )
+    members.add(project.owner_id)
+    pending = set(
+        db.session.scalars(
+            select(Invitation.invitee_id).where(
+                Invitation.project_id == project_id,
+                Invitation.status == InvitationStatus.PENDING,
+                Invitation.invitee_id.in_(user_ids),
+            )
+        )
+    )
+    invitees = [user for user in users if user.id not in members and user.id not in pending]
+
+    if invitees:
+        created = db.session.execute(
+            insert(Invitation)
+            .returning(Invitation.id, Invitation.invitee_id, sort_by_parameter_order=True),
+            [
+                {
+                    "project_id": project_id,
+                    "inviter_id": current_user.id,
+                    "invitee_id": user.id,
+                    "status": InvitationStatus.PENDING,
+                }
+                for user in invitees
+            ],
+        ).all()
+        # Digest users hear about the invitation in their next daily email.
+        instant = [user for user in invitees if wants_instant_email(user)]
+        notify_invitations(
+            [row._asdict() for row in created],
+            project,
+            current_user,
+            emailed_ids={user.id for user in instant},
+        )
+        db.session.commit()
+
+        send_bulk_email(
+            {
+                "subject": f"You've been invited to {project.name}",
+                "recipients": [user.email],
+                "body": (
+                    f"Hello {user.name},\n\n"
+                    f"{current_user.name} invited you to collaborate on '{project.name}'.\n"
+                    "Visit your dashboard to respond to this invitation."
+                ),
+            }
+            for user in instant
+        )
+
+    skipped_unknown = len(emails) - len(users)
+    skipped_existing = len(users) - len(invitees)
+    message = f"{len(invitees)} invitation(s) sent."
+    if skipped_unknown:
+        message += f" {skipped_unknown} email(s) are not registered."
+    if skipped_existing:
+        message += f" {skipped_existing} already a member or invited."
+    flash(message, "success" if invitees else "info")
+    return redirect(url_for("projects.detail", project_id=project_id))
+
+
 @projects_bp.route("/invitations/<int:invitation_id>/<string:action>", methods=["POST"])
 @login_required
 def handle_invitation(invitation_id: int, action: str):
@@ -386,11 +847,142 @@ def handle_invitation(invitation_id: int, action: str):
     else:
         flash("Unknown action.", "danger")
 
-    Notification.query.filter_by(
+    # Through the session, so the tombstone listener tells synced clients.
+    for notification in Notification.query.filter_by(
         reference=f"invite:{invitation.id}", user_id=current_user.id
-    ).delete(synchronize_session=False)
+    ):
+        db.session.delete(notification)
 
     db.session.commit()
     return redirect(request.referrer or url_for("dashboard.notifications"))
 
 
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv": (export_csv, "text/csv"),
+}
+
+
+@projects_bp.route("/<int:project_id>/export.<string:fmt>")
+@login_required
+def export_project(project_id: int, fmt: str):
+    project = _load_project(project_id)
+    if project.owner_id != current_user.id:
+        abort(403)
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+
+    exporter, mimetype = EXPORT_FORMATS[fmt]
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    response = current_app.response_class(
+        stream_with_context(exporter(project, batch_size)), mimetype=mimetype
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="project-{project.id}.{fmt}"'
+    return response
+
+
+@projects_bp.cli.command("export")
+@click.argument("project_id", type=int)
+@click.option("--format", "fmt", type=click.Choice(sorted(EXPORT_FORMATS)), default="ndjson")
+@click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-")
+def export_command(project_id: int, fmt: str, output) -> None:
+    """Stream a project's members, invitations and tasks to a file."""
+    project = db.session.get(Project, project_id)
+    if project is None:
+        raise click.ClickException(f"Project {project_id} does not exist.")
+    exporter, _ = EXPORT_FORMATS[fmt]
+    for chunk in exporter(project, current_app.config.get("EXPORT_BATCH_SIZE", 1000)):
+        output.write(chunk)
+
+
+@projects_bp.cli.command("import")
+@click.argument("source", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--format", "fmt", type=click.Choice(sorted(EXPORT_FORMATS)), default=None)
+@click.option("--owner", "owner_email", help="Owner email (required for CSV files).")
+@click.option("--name", help="Name for the new project.")
+@click.option("--chunk-size", type=int, default=5000, show_default=True)
+def import_command(source, fmt: str | None, owner_email: str | None, name: str | None, chunk_size: int) -> None:
+    """Create a new project from an NDJSON or CSV export."""
+    fmt = fmt or ("csv" if source.name.endswith(".csv") else "ndjson")
+    try:
+        project, task_count = import_project(
+            source, owner_email=owner_email, name=name, fmt=fmt, chunk_size=chunk_size
+        )
+    except ValueError as exc:  # ProjectImportError or a malformed field
+        db.session.rollback()
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"Imported project {project.id} ({project.name}) with {task_count} tasks.")
+
+
+@projects_bp.cli.command("purge")
+@click.argument("project_id", type=int)
+@click.option("--batch-size", type=int, default=1000, show_default=True)
+def purge_command(project_id: int, batch_size: int) -> None:
+    """Hard-delete a project and all of its rows in batches."""
+    if db.session.get(Project, project_id) is None:
+        raise click.ClickException(f"Project {project_id} does not exist.")
+
+    def report(progress) -> None:
+        click.echo(f"{progress.state}: {progress.deleted_tasks}/{progress.total_tasks} tasks deleted")
+
+    purge_project(project_id, batch_size=batch_size, on_progress=report)
+
+
+@projects_bp.cli.command("purge-deleted")
+@click.option("--older-than-minutes", type=int, default=15, show_default=True)
+@click.option("--batch-size", type=int, default=None, help="Defaults to PROJECT_PURGE_BATCH_SIZE.")
+def purge_deleted_command(older_than_minutes: int, batch_size: int | None) -> None:
+    """Finish purging deleted projects whose background job did not complete."""
+    if batch_size is None:
+        batch_size = current_app.config.get("PROJECT_PURGE_BATCH_SIZE", 1000)
+    purged = purge_deleted(timedelta(minutes=older_than_minutes), batch_size=batch_size)
+    click.echo(f"Purged {len(purged)} project(s).")
+
+
+@projects_bp.cli.command("counters")
+@click.option("--repair", is_flag=True, help="Rewrite counters that drifted.")
+def counters_command(repair: bool) -> None:
+    """Verify per-project task counters against the tasks table."""
+    drifted = verify_counters(repair=repair)
+    for row in drifted:
+        click.echo(
+            f"project {row['id']}: total={row['tasks_total']} todo={row['tasks_todo']} "
+            f"in_progress={row['tasks_in_progress']} done={row['tasks_done']}"
+        )
+    verb = "Repaired" if repair else "Found"
+    click.echo(f"{verb} {len(drifted)} project(s) with drifted counters.")
+
+
+@projects_bp.cli.command("recur")
+@click.option("--horizon-days", type=int, default=None, help="Defaults to RECURRENCE_HORIZON_DAYS.")
+@click.option("--batch-size", type=int, default=500, show_default=True)
+def recur_command(horizon_days: int | None, batch_size: int) -> None:
+    """Create upcoming instances of recurring tasks; safe to run from cron."""
+    if horizon_days is None:
+        horizon_days = current_app.config.get("RECURRENCE_HORIZON_DAYS", 14)
+    created = materialize_due(horizon_days=horizon_days, batch_size=batch_size)
+    click.echo(f"Created {created} recurring task instance(s).")
+
+
+@projects_bp.cli.command("rollup")
+@click.option("--day", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Defaults to yesterday (UTC).")
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Rebuild every day since then.")
+def rollup_command(day: datetime | None, since: datetime | None) -> None:
+    """Aggregate a day of task activity into the chart rows; run daily from cron."""
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    if since is not None:
+        written = roll_up(since.date(), yesterday)
+    else:
+        target = day.date() if day else yesterday
+        written = roll_up(target)
+    click.echo(f"Wrote {written} daily stats row(s).")
+
+
+@projects_bp.cli.command("prune-activity")
+@click.option("--keep-months", type=int, default=None, help="Defaults to ACTIVITY_RETENTION_MONTHS.")
+def prune_activity_command(keep_months: int | None) -> None:
+    """Delete activity log buckets older than the retention window."""
+    if keep_months is None:
+        keep_months = current_app.config.get("ACTIVITY_RETENTION_MONTHS", 12)
+    deleted = prune_activity(keep_months)
+    click.echo(f"Deleted {deleted} activity entr{'y' if deleted == 1 else 'ies'}.")
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, event, insert, inspect, or_, select, update
+
+from ..extensions import db
+from ..models import Project, Task, TaskStatus, task_dependencies
+
+# Task columns the schedule is computed from; changing one invalidates it.
+SCHEDULE_FIELDS = ("title", "status", "due_date")
+
+
+class DependencyError(ValueError):
+    """Raised when a dependency edge is not allowed, e.g. it would close a cycle."""
+
+
+@dataclass(frozen=True)
+class ScheduledTask:
+    id: int
+    title: str
+    status: TaskStatus
+    due_date: datetime | None
+    blocked_by: tuple[int, ...]
+    # Due date pushed back by unfinished blockers; None for done or undated work.
+    projected_finish: datetime | None
+    # The blocker that set ``projected_finish``, if any.
+    driver_id: int | None
+
+    @property
+    def is_slipping(self) -> bool:
+        return (
+            self.projected_finish is not None
+            and self.due_date is not None
+            and self.projected_finish > self.due_date
+        )
+
+
+@dataclass(frozen=True)
+class Schedule:
+    project_id: int
+    revision: int
+    tasks: tuple[ScheduledTask, ...]  # topological order
+    critical_path: tuple[int, ...]
+    projected_finish: datetime | None
+
+
+def bump_schedule(*project_ids: int) -> None:
+    if project_ids:
+        db.session.execute(
+            update(Project)
+            .where(Project.id.in_(project_ids))
+            .values(schedule_rev=Project.schedule_rev + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _project_edges(project_id: int) -> list[tuple[int, int]]:
+    return db.session.execute(
+        select(task_dependencies.c.task_id, task_dependencies.c.blocker_id).where(
+            task_dependencies.c.project_id == project_id
+        )
+    ).all()
+
+
+def _reaches(successors: dict[int, list[int]], start: int, target: int) -> bool:
+    """Iterative DFS; visits each task and edge at most once."""
+    stack = [start]
+    seen = {start}
+    while stack:
+        node = stack.pop()
+        if node == target:
+            return True
+        for nxt in successors.get(node, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return False
+
+
+def add_dependency(task: Task, blocker: Task) -> bool:
+    """Stage "``task`` waits on ``blocker``"; return False if the edge already exists.
+
+    The project's revision is bumped before the graph is read. That write
+    takes the project row (or, on SQLite, the database) lock, so two requests
+    cannot each pass the cycle check with edges that form a loop together.
+    """
+    if blocker.project_id != task.project_id:
+        raise DependencyError("Tasks can only depend on tasks in the same project.")
+    if blocker.id == task.id:
+        raise DependencyError("A task cannot depend on itself.")
+
+    bump_schedule(task.project_id)
+    successors: dict[int, list[int]] = defaultdict(list)
+    for dependent, blocked_by in _project_edges(task.project_id):
+        if (dependent, blocked_by) == (task.id, blocker.id):
+            return False
+        successors[blocked_by].append(dependent)
+    # blocker -> task closes a loop exactly when task already leads to blocker.
+    if _reaches(successors, task.id, blocker.id):
+        raise DependencyError(f"'{blocker.title}' already waits on '{task.title}'.")
+
+    db.session.execute(
+        insert(task_dependencies).values(
+            project_id=task.project_id, task_id=task.id, blocker_id=blocker.id
+        )
+    )
+    return True
+
+
+def remove_dependency(project_id: int, task_id: int, blocker_id: int) -> bool:
+    result = db.session.execute(
+        delete(task_dependencies).where(
+            task_dependencies.c.task_id == task_id,
+            task_dependencies.c.blocker_id == blocker_id,
+            task_dependencies.c.project_id == project_id,
+        )
+    )
+    if result.rowcount:
+        bump_schedule(project_id)
+    return bool(result.rowcount)
+
+
+def _collect_schedule_changes(session, flush_context, instances) -> None:
+    projects: set[int] = set()
+    deleted_ids = []
+    for obj in session.new:
+        if isinstance(obj, Task) and obj.project_id is not None:
+            projects.add(obj.project_id)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            projects.add(obj.project_id)
+            deleted_ids.append(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Task) and any(
+            inspect(obj).attrs[field].history.has_changes() for field in SCHEDULE_FIELDS
+        ):
+            projects.add(obj.project_id)
+    if deleted_ids:
+        # Foreign keys are not enforced on SQLite, so drop the edges by hand.
+        session.connection().execute(
+            delete(task_dependencies).where(
+                or_(
+                    task_dependencies.c.task_id.in_(deleted_ids),
+                    task_dependencies.c.blocker_id.in_(deleted_ids),
+                )
+            )
+        )
+    if projects:
+        session.info.setdefault("schedule_projects", set()).update(projects)
+
+
+def _bump_changed_schedules(session, flush_context) -> None:
+    projects = session.info.pop("schedule_projects", None)
+    if projects:
+        session.connection().execute(
+            update(Project)
+            .where(Project.id.in_(projects))
+            .values(schedule_rev=Project.schedule_rev + 1)
+        )
+
+
+def register_schedule_listeners() -> None:
+    if not event.contains(db.session, "after_flush", _bump_changed_schedules):
+        event.listen(db.session, "before_flush", _collect_schedule_changes)
+        event.listen(db.session, "after_flush", _bump_changed_schedules)
+
+
+def compute_schedule(project_id: int, revision: int) -> Schedule:
+    """Earliest finish of every task given its blockers, in O(V + E).
+
+    Tasks are visited in topological order (Kahn's algorithm). A task cannot
+    finish before its own due date nor before its latest unfinished blocker;
+    the blocker that pushes it furthest is its driver, and following drivers
+    back from the latest-finishing task yields the critical path.
+    """
+    rows = db.session.execute(
+        select(Task.id, Task.title, Task.status, Task.due_date)
+        .where(Task.project_id == project_id)
+        .order_by(Task.id)
+    ).all()
+    tasks = {row.id: row for row in rows}
+
+    blockers: dict[int, list[int]] = defaultdict(list)
+    successors: dict[int, list[int]] = defaultdict(list)
+    indegree = dict.fromkeys(tasks, 0)
+    for dependent, blocker in _project_edges(project_id):
+        if dependent in tasks and blocker in tasks:
+            blockers[dependent].append(blocker)
+            successors[blocker].append(dependent)
+            indegree[dependent] += 1
+
+    ready = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+    order = []
+    while ready:
+        task_id = ready.popleft()
+        order.append(task_id)
+        for dependent in successors.get(task_id, ()):
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    if len(order) != len(tasks):
+        raise DependencyError(f"Project {project_id} has a dependency cycle.")
+
+    finish: dict[int, datetime | None] = {}
+    driver: dict[int, int | None] = {}
+    for task_id in order:
+        task = tasks[task_id]
+        if task.status == TaskStatus.DONE:
+            finish[task_id], driver[task_id] = None, None
+            continue
+        latest, by = task.due_date, None
+        for blocker in blockers.get(task_id, ()):
+            blocker_finish = finish[blocker]
+            if blocker_finish is not None and (latest is None or blocker_finish > latest):
+                latest, by = blocker_finish, blocker
+        finish[task_id], driver[task_id] = latest, by
+
+    # On ties prefer the most downstream task, whose drivers lead through the rest.
+    end = max(
+        (task_id for task_id in reversed(order) if finish[task_id] is not None),
+        key=lambda task_id: finish[task_id],
+        default=None,
+    )
+    path = []
+    while end is not None:
+        path.append(end)
+        end = driver[end]
+    path.reverse()
+
+    return Schedule(
+        project_id=project_id,
+        revision=revision,
+        tasks=tuple(
+            ScheduledTask(
+                id=task_id,
+                title=tasks[task_id].title,
+                status=tasks[task_id].status,
+                due_date=tasks[task_id].due_date,
+                blocked_by=tuple(sorted(blockers.get(task_id, ()))),
+                projected_finish=finish[task_id],
+                driver_id=driver[task_id],
+            )
+            for task_id in order
+        ),
+        critical_path=tuple(path),
+        projected_finish=finish[path[-1]] if path else None,
+    )
+
+
+_cache: OrderedDict[int, Schedule] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_schedule(project_id: int) -> Schedule:
+    """Return the project's schedule, recomputing only after its revision moved.
+
+    Reading the revision is one primary-key lookup, so every worker sees
+    invalidations made by any other worker without sharing the cache.
+    """
+    revision = db.session.scalar(select(Project.schedule_rev).where(Project.id == project_id))
+    with _cache_lock:
+        cached = _cache.get(project_id)
+        if cached is not None and cached.revision == revision:
+            _cache.move_to_end(project_id)
+            return cached
+
+    schedule = compute_schedule(project_id, revision)
+    with _cache_lock:
+        _cache[project_id] = schedule
+        _cache.move_to_end(project_id)
+        while len(_cache) > current_app.config.get("SCHEDULE_CACHE_SIZE", 256):
+            _cache.popitem(last=False)
+    return schedule
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import chain, islice
+
+from sqlalchemy import insert, select
+
+from ..extensions import db
+from ..models import (
+    Invitation,
+    InvitationStatus,
+    Membership,
+    Project,
+    Role,
+    Task,
+    TaskStatus,
+    User,
+    task_members,
+)
+from .counters import verify_counters
+
+CSV_FIELDS = ("id", "title", "description", "due_date", "status", "created_by", "assignees")
+
+
+class ProjectImportError(ValueError):
+    """Raised when an import file references data that cannot be resolved."""
+
+
+class _EmailLookup:
+    """Bidirectional user id <-> email cache; only touched users are loaded."""
+
+    def __init__(self) -> None:
+        self.by_id: dict[int, str] = {}
+        self.by_email: dict[str, int | None] = {}
+
+    def email(self, user_id: int | None) -> str | None:
+        if user_id is None:
+            return None
+        if user_id not in self.by_id:
+            self.by_id[user_id] = db.session.scalar(select(User.email).where(User.id == user_id))
+        return self.by_id[user_id]
+
+    def user_id(self, email: str | None) -> int | None:
+        if not email:
+            return None
+        email = email.lower()
+        if email not in self.by_email:
+            self.by_email[email] = db.session.scalar(select(User.id).where(User.email == email))
+        return self.by_email[email]
+
+    def prime(self, rows: Iterable[tuple[int, str]]) -> None:
+        for user_id, email in rows:
+            self.by_id[user_id] = email
+            self.by_email[email] = user_id
+
+
+def _iter_task_rows(project_id: int, batch_size: int, lookup: _EmailLookup) -> Iterator[dict]:
+    """Yield task dicts with assignee emails, merge-joining two id-ordered streams."""
+    tasks = db.session.execute(
+        select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.due_date,
+            Task.status,
+            Task.created_by_id,
+        )
+        .where(Task.project_id == project_id)
+        .order_by(Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    assignments = iter(
+        db.session.execute(
+            select(task_members.c.task_id, task_members.c.user_id)
+            .join(Task, Task.id == task_members.c.task_id)
+            .where(Task.project_id == project_id)
+            .order_by(task_members.c.task_id)
+            .execution_options(yield_per=batch_size)
+        )
+    )
+    pending = next(assignments, None)
+
+    for task in tasks:
+        while pending is not None and pending.task_id < task.id:
+            pending = next(assignments, None)
+        assignees = []
+        while pending is not None and pending.task_id == task.id:
+            assignees.append(lookup.email(pending.user_id))
+            pending = next(assignments, None)
+        yield {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "status": task.status.value,
+            "created_by": lookup.email(task.created_by_id),
+            "assignees": assignees,
+        }
+
+
+def _prime_members(project: Project, lookup: _EmailLookup) -> list[tuple[str, Role]]:
+    members = db.session.execute(
+        select(User.id, User.email, Membership.role)
+        .join(Membership, Membership.user_id == User.id)
+        .where(Membership.project_id == project.id, Membership.is_active.is_(True))
+    ).all()
+    lookup.prime((member.id, member.email) for member in members)
+    return [(member.email, member.role) for member in members]
+
+
+def export_ndjson(project: Project, batch_size: int = 1000) -> Iterator[str]:
+    """Stream ``project`` as JSON Lines: project, members, invitations, then tasks."""
+    lookup = _EmailLookup()
+    members = _prime_members(project, lookup)
+
+    yield _line(
+        type="project",
+        name=project.name,
+        description=project.description,
+        owner=lookup.email(project.owner_id),
+    )
+    for email, role in members:
+        yield _line(type="member", email=email, role=role.value)
+
+    invitations = db.session.execute(
+        select(Invitation.invitee_id, Invitation.status).where(Invitation.project_id == project.id)
+    )
+    for invitation in invitations:
+        yield _line(
+            type="invitation",
+            email=lookup.email(invitation.invitee_id),
+            status=invitation.status.value,
+        )
+
+    for task in _iter_task_rows(project.id, batch_size, lookup):
+        yield _line(type="task", **task)
+
+
+def export_csv(project: Project, batch_size: int = 1000) -> Iterator[str]:
+    """Stream ``project`` tasks as CSV; assignees are ``;``-separated emails."""
+    lookup = _EmailLookup()
+    _prime_members(project, lookup)
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for task in _iter_task_rows(project.id, batch_size, lookup):
+        writer.writerow({**task, "assignees": ";".join(filter(None, task["assignees"]))})
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _line(**record) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _parse_ndjson(lines: Iterable[str]) -> Iterator[dict]:
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ProjectImportError(f"Line {number}: invalid JSON ({exc.msg}).") from exc
+
+
+def _parse_csv(lines: Iterable[str]) -> Iterator[dict]:
+    for row in csv.DictReader(lines):
+        yield {
+            "type": "task",
+            **row,
+            "assignees": [email for email in (row.get("assignees") or "").split(";") if email],
+        }
+
+
+def import_project(
+    lines: Iterable[str],
+    owner_email: str | None = None,
+    name: str | None = None,
+    fmt: str = "ndjson",
+    chunk_size: int = 5000,
+) -> tuple[Project, int]:
+    """Create a new project from an export stream and return it with its task count.
+
+    Tasks are inserted in ``chunk_size`` executemany batches together with their
+    ``task_members`` rows, so memory use is bounded by one chunk regardless of
+    the file size. ``owner_email`` overrides (and for CSV, supplies) the owner.
+    """
+    lookup = _EmailLookup()
+    records = _parse_ndjson(lines) if fmt == "ndjson" else _parse_csv(lines)
+
+    first = next(records, None)
+    header = first if first and first.get("type") == "project" else {}
+    owner_id = lookup.user_id(owner_email or header.get("owner"))
+    if owner_id is None:
+        raise ProjectImportError("The project owner is not a registered user.")
+
+    project = Project(
+        name=name or header.get("name") or "Imported project",
+        description=header.get("description"),
+        owner_id=owner_id,
+    )
+    db.session.add(project)
+    db.session.flush()
+    db.session.add(Membership(user_id=owner_id, project_id=project.id, role=Role.OWNER))
+    db.session.flush()
+
+    if first is not None and not header:
+        records = chain([first], records)
+
+    task_count = 0
+    tasks = _handle_side_records(records, project, owner_id, lookup)
+    while chunk := list(islice(tasks, chunk_size)):
+        task_count += _insert_task_chunk(chunk, project.id, owner_id, lookup)
+
+    db.session.commit()
+    # Core bulk inserts bypass the flush hooks that maintain the counters.
+    verify_counters([project.id], repair=True)
+    return project, task_count
+
+
+def _handle_side_records(
+    records: Iterator[dict], project: Project, owner_id: int, lookup: _EmailLookup
+) -> Iterator[dict]:
+    """Insert member/invitation records as they stream past, yielding only tasks."""
+    seen_members = {owner_id}
+    for record in records:
+        kind = record.get("type")
+        if kind == "task":
+            yield record
+            continue
+        user_id = lookup.user_id(record.get("email"))
+        if user_id is None:
+            continue
+        if kind == "member" and user_id not in seen_members:
+            seen_members.add(user_id)
+            db.session.execute(
+                insert(Membership),
+                [{"user_id": user_id, "project_id": project.id, "role": Role.MEMBER}],
+            )
+        elif kind == "invitation" and record.get("status") == InvitationStatus.PENDING.value:
+            db.session.execute(
+                insert(Invitation),
+                [{"project_id": project.id, "inviter_id": owner_id, "invitee_id": user_id}],
+            )
+
+
+def _insert_task_chunk(chunk: list[dict], project_id: int, owner_id: int, lookup: _EmailLookup) -> int:
+    rows = []
+    for record in chunk:
+        assignee_ids = [lookup.user_id(email) for email in record.get("assignees") or []]
+        assignee_ids = [user_id for user_id in assignee_ids if user_id is not None]
+        due_date = record.get("due_date")
+        rows.append(
+            {
+                "project_id": project_id,
+                "title": (record.get("title") or "Untitled")[:150],
+                "description": record.get("description") or None,
+                "due_date": datetime.fromisoformat(due_date) if due_date else None,
+                "status": TaskStatus(record.get("status") or TaskStatus.TODO.value),
+                "created_by_id": lookup.user_id(record.get("created_by")) or owner_id,
+                "assigned_to_id": assignee_ids[0] if assignee_ids else None,
+                "_assignees": assignee_ids,
+            }
+        )
+
+    new_ids = db.session.scalars(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True),
+        [{key: value for key, value in row.items() if key != "_assignees"} for row in rows],
+    ).all()
+    links = [
+        {"task_id": task_id, "user_id": user_id}
+        for task_id, row in zip(new_ids, rows)
+        for user_id in row["_assignees"]
+    ]
+    if links:
+        db.session.execute(insert(task_members), links)
+    return len(rows)
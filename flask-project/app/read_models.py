@@ -0,0 +1,233 @@
+"""Read-only rows for list views.
+
+The functions here select only the columns a page renders. They return
+NamedTuple rows, which have no ``__dict__``, no instance state and never
+enter the session identity map. Dashboards, boards and inboxes can list
+thousands of entries without paying for change tracking they never use.
+Views that modify data keep using the ORM models.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import case, func, or_, select
+
+from .extensions import db
+from .models import (
+    Membership,
+    Notification,
+    NotificationType,
+    Project,
+    RecurrenceFrequency,
+    Role,
+    Task,
+    TaskStatus,
+    User,
+    initials_for,
+    task_dependencies,
+    task_members,
+)
+
+
+class ProjectCard(NamedTuple):
+    id: int
+    name: str
+    description: str | None
+    created_at: datetime
+    tasks_total: int
+    tasks_done: int
+    role: str
+
+
+class ArchivedProject(NamedTuple):
+    id: int
+    name: str
+
+
+class MemberRow(NamedTuple):
+    id: int
+    name: str
+    avatar_filename: str | None
+
+    @property
+    def initials(self) -> str:
+        return initials_for(self.name)
+
+
+class TaskCard(NamedTuple):
+    id: int
+    title: str
+    description: str | None
+    status: TaskStatus
+    due_date: datetime | None
+    assigned_to_id: int | None
+    recurrence_freq: RecurrenceFrequency | None
+    recurrence_interval: int
+    recurrence_until: datetime | None
+    recurrence_count: int | None
+    recurrence_parent_id: int | None
+    version: int
+    assignees: tuple[MemberRow, ...] = ()
+    # Unfinished tasks this one waits on.
+    blocked_by: tuple[int, ...] = ()
+
+
+class NotificationRow(NamedTuple):
+    id: int
+    type: NotificationType
+    payload: dict[str, Any]
+    is_read: bool
+    created_at: datetime
+
+
+def project_cards(user_id: int) -> list[ProjectCard]:
+    """Live projects the user owns or is an active member of, newest first, in one query."""
+    membership = Membership.__table__
+    query = (
+        select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.created_at,
+            Project.tasks_total,
+            Project.tasks_done,
+            case(
+                (Project.owner_id == user_id, "owner"),
+                (membership.c.role == Role.OWNER, "owner"),
+                else_="member",
+            ).label("role"),
+        )
+        .outerjoin(
+            membership,
+            (membership.c.project_id == Project.id)
+            & (membership.c.user_id == user_id)
+            & membership.c.is_active.is_(True),
+        )
+        .where(
+            Project.active_filter(),
+            or_(Project.owner_id == user_id, membership.c.id.isnot(None)),
+        )
+        .order_by(Project.created_at.desc(), Project.id.desc())
+    )
+    return [ProjectCard(*row) for row in db.session.execute(query)]
+
+
+def archived_projects(user_id: int) -> list[ArchivedProject]:
+    query = (
+        select(Project.id, Project.name)
+        .where(
+            Project.owner_id == user_id,
+            Project.archived_at.isnot(None),
+            Project.deleted_at.is_(None),
+        )
+        .order_by(Project.archived_at.desc())
+    )
+    return [ArchivedProject(*row) for row in db.session.execute(query)]
+
+
+def project_members(project_id: int, owner_id: int) -> dict[int, MemberRow]:
+    """The owner followed by every active member, keyed by user id."""
+    query = (
+        select(User.id, User.name, User.avatar_filename)
+        .outerjoin(
+            Membership,
+            (Membership.user_id == User.id)
+            & (Membership.project_id == project_id)
+            & Membership.is_active.is_(True),
+        )
+        .where(or_(User.id == owner_id, Membership.id.isnot(None)))
+        .order_by(case((User.id == owner_id, 0), else_=1), Membership.id)
+    )
+    return {row.id: MemberRow(*row) for row in db.session.execute(query)}
+
+
+def task_cards(
+    project_id: int,
+    status: TaskStatus,
+    members: dict[int, MemberRow],
+    batch_size: int = 500,
+) -> Iterator[TaskCard]:
+    """Stream one board column, resolving assignees one batch at a time."""
+    query = (
+        select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.due_date,
+            Task.assigned_to_id,
+            Task.recurrence_freq,
+            Task.recurrence_interval,
+            Task.recurrence_until,
+            Task.recurrence_count,
+            Task.recurrence_parent_id,
+            Task.version,
+        )
+        .where(Task.project_id == project_id, Task.status == status)
+        .order_by(Task.due_date.asc().nulls_last(), Task.created_at.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.session.execute(query).partitions():
+        task_ids = [row.id for row in partition]
+        assignee_ids: dict[int, list[int]] = {}
+        for task_id, user_id in db.session.execute(
+            select(task_members.c.task_id, task_members.c.user_id).where(
+                task_members.c.task_id.in_(task_ids)
+            )
+        ):
+            assignee_ids.setdefault(task_id, []).append(user_id)
+
+        blocker_ids: dict[int, list[int]] = {}
+        for task_id, blocker_id in db.session.execute(
+            select(task_dependencies.c.task_id, task_dependencies.c.blocker_id)
+            .join(Task, Task.id == task_dependencies.c.blocker_id)
+            .where(task_dependencies.c.task_id.in_(task_ids), Task.status != TaskStatus.DONE)
+        ):
+            blocker_ids.setdefault(task_id, []).append(blocker_id)
+
+        # Assignees who have since left the project are not in ``members``.
+        missing = {uid for uids in assignee_ids.values() for uid in uids} - members.keys()
+        people = dict(members)
+        if missing:
+            people.update(
+                (row.id, MemberRow(*row))
+                for row in db.session.execute(
+                    select(User.id, User.name, User.avatar_filename).where(User.id.in_(missing))
+                )
+            )
+
+        for row in partition:
+            yield TaskCard(
+                *row,
+                assignees=tuple(people[uid] for uid in assignee_ids.get(row.id, ())),
+                blocked_by=tuple(sorted(blocker_ids.get(row.id, ()))),
+            )
+
+
+def notification_rows(
+    user_id: int, type: NotificationType | None = None, limit: int | None = None
+) -> list[NotificationRow]:
+    query = select(
+        Notification.id,
+        Notification.type,
+        Notification.payload,
+        Notification.is_read,
+        Notification.created_at,
+    ).where(Notification.user_id == user_id)
+    if type is not None:
+        query = query.where(Notification.type == type)
+    query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return [NotificationRow(*row) for row in db.session.execute(query)]
+
+
+def unread_notification_count(user_id: int) -> int:
+    return db.session.scalar(
+        select(func.count(Notification.id)).where(
+            Notification.user_id == user_id, Notification.is_read.is_(False)
+        )
+    )
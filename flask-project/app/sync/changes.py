@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, or_, select, true, union, update
+
+from ..extensions import db
+from ..models import (
+    Membership,
+    Notification,
+    Project,
+    SyncEntity,
+    SyncState,
+    Task,
+    Tombstone,
+    User,
+    task_members,
+)
+
+_TRACKED = {
+    Project: SyncEntity.PROJECT,
+    Task: SyncEntity.TASK,
+    Membership: SyncEntity.MEMBERSHIP,
+    Notification: SyncEntity.NOTIFICATION,
+}
+
+
+def _tombstone_deletes(session, flush_context, instances) -> None:
+    """Leave a tombstone for every tracked row deleted through the ORM."""
+    for obj in session.deleted:
+        entity = _TRACKED.get(type(obj))
+        if entity is None:
+            continue
+        session.add(
+            Tombstone(
+                entity=entity,
+                entity_id=obj.id,
+                project_id=obj.id if entity is SyncEntity.PROJECT else getattr(obj, "project_id", None),
+                user_id=obj.user_id if entity is SyncEntity.NOTIFICATION else None,
+            )
+        )
+
+
+_SYNCED = (*_TRACKED, Tombstone)
+_SYNCED_TABLES = tuple(model.__table__ for model in _SYNCED)
+
+
+def _reset_tasks(session, criterion) -> None:
+    session.execute(
+        update(Task)
+        .where(criterion)
+        .values(sync_rev=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _reset_reassigned_tasks(session, flush_context, instances) -> None:
+    """Queue tasks whose assignee collection changed for a new sync revision.
+
+    ``task_members`` has no revision of its own and a collection change
+    issues no UPDATE on ``tasks``, so the task row is reset by hand.
+    """
+    task_ids = set()
+    for obj in session.dirty:
+        if isinstance(obj, Task):
+            if inspect(obj).attrs.assignees.history.has_changes():
+                task_ids.add(obj.id)
+        elif isinstance(obj, User):
+            history = inspect(obj).attrs.tasks_assigned.history
+            task_ids.update(task.id for task in (*history.added, *history.deleted))
+    task_ids.discard(None)
+    if task_ids:
+        _reset_tasks(session, Task.id.in_(task_ids))
+
+
+def _note_flushed_writes(session, flush_context) -> None:
+    # new/dirty/deleted still hold the flushed objects at this point.
+    if any(isinstance(obj, _SYNCED) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["sync_pending"] = True
+
+
+def _note_statement_writes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is task_members:
+        _reset_tasks(orm_execute_state.session, Task.id.in_(_member_task_ids(orm_execute_state)))
+    elif table in _SYNCED_TABLES:
+        orm_execute_state.session.info["sync_pending"] = True
+
+
+def _member_task_ids(orm_execute_state):
+    """The tasks a Core statement on ``task_members`` is about to touch.
+
+    Runs before the statement, so deleted links can still be selected.
+    """
+    parameters = orm_execute_state.parameters
+    rows = parameters if isinstance(parameters, (list, tuple)) else [parameters or {}]
+    task_ids = {row["task_id"] for row in rows if "task_id" in row}
+    if task_ids:
+        return sorted(task_ids)
+    # No ids to read: fall back to every link the statement could match.
+    linked = select(task_members.c.task_id)
+    whereclause = getattr(orm_execute_state.statement, "whereclause", None)
+    return linked.where(whereclause) if whereclause is not None else linked
+
+
+def _stamp_revision(session) -> None:
+    """Give the rows this transaction wrote the next sync revision.
+
+    Runs last thing before commit. Bumping the counter locks its row until
+    the commit, so revisions are handed out in commit order. A reader that
+    sees revision R therefore knows every write up to R is visible, however
+    long ago the rows were flushed.
+    """
+    # Flush first: commit's own flush runs after this hook.
+    session.flush()
+    if not session.info.pop("sync_pending", False):
+        return
+    connection = session.connection()
+    state = SyncState.__table__
+    bumped = connection.execute(
+        update(state).where(state.c.id == 1).values(revision=state.c.revision + 1)
+    )
+    if not bumped.rowcount:
+        connection.execute(insert(state).values(id=1, revision=1, pruned_revision=0))
+    revision = connection.execute(select(state.c.revision).where(state.c.id == 1)).scalar_one()
+    for table in _SYNCED_TABLES:
+        values = {"sync_rev": revision}
+        if "updated_at" in table.c:
+            # Stamping is not an edit; keep onupdate away from the timestamp.
+            values["updated_at"] = table.c.updated_at
+        connection.execute(update(table).where(table.c.sync_rev.is_(None)).values(**values))
+
+
+def _discard_pending(session, previous_transaction=None) -> None:
+    session.info.pop("sync_pending", None)
+
+
+def register_sync_listeners() -> None:
+    if not event.contains(db.session, "before_flush", _tombstone_deletes):
+        event.listen(db.session, "before_flush", _tombstone_deletes)
+        event.listen(db.session, "before_flush", _reset_reassigned_tasks)
+        event.listen(db.session, "after_flush", _note_flushed_writes)
+        event.listen(db.session, "do_orm_execute", _note_statement_writes)
+        event.listen(db.session, "before_commit", _stamp_revision)
+        event.listen(db.session, "after_rollback", _discard_pending)
+
+
+def sync_revisions() -> tuple[int, int]:
+    """Return the latest committed revision and the newest pruned one."""
+    row = db.session.execute(
+        select(SyncState.revision, SyncState.pruned_revision).where(SyncState.id == 1)
+    ).first()
+    return (row.revision, row.pruned_revision) if row else (0, 0)
+
+
+def record_project_removed(project: Project, include_owner: bool = True) -> None:
+    """Tell everyone on the project that it is gone from their view.
+
+    Used for soft deletes and archiving, where the row survives for a while
+    but users stop seeing it, so project-scoped tombstones would never reach
+    them. The purge that follows removes tasks, memberships and notifications
+    with Core DELETEs; clients drop a project's children with its tombstone.
+    """
+    audience = set(
+        db.session.scalars(
+            select(Membership.user_id).where(
+                Membership.project_id == project.id, Membership.is_active.is_(True)
+            )
+        )
+    )
+    audience.add(project.owner_id)
+    if not include_owner:
+        audience.discard(project.owner_id)
+    if not audience:
+        return
+    now = datetime.utcnow()
+    db.session.execute(
+        insert(Tombstone),
+        [
+            {
+                "entity": SyncEntity.PROJECT,
+                "entity_id": project.id,
+                "project_id": project.id,
+                "user_id": user_id,
+                "deleted_at": now,
+            }
+            for user_id in sorted(audience)
+        ],
+    )
+
+
+def record_notifications_removed(*criteria) -> None:
+    """Tombstone the notifications a Core DELETE on ``criteria`` is about to remove.
+
+    Bulk deletes skip the ORM, and with it the tombstone listener.
+    """
+    db.session.execute(
+        insert(Tombstone).from_select(
+            ["entity", "entity_id", "user_id", "deleted_at"],
+            select(
+                literal(SyncEntity.NOTIFICATION, Tombstone.entity.type),
+                Notification.id,
+                Notification.user_id,
+                literal(datetime.utcnow(), Tombstone.deleted_at.type),
+            ).where(*criteria),
+        )
+    )
+
+
+def touch_memberships(project: Project) -> None:
+    """Make the project's members re-fetch it in full on their next sync."""
+    db.session.execute(
+        update(Membership)
+        .where(Membership.project_id == project.id, Membership.is_active.is_(True))
+        .values(updated_at=datetime.utcnow())
+    )
+
+
+@dataclass
+class ChangeSet:
+    until: int
+    projects: list
+    tasks: list
+    assignees: dict[int, list[int]]
+    memberships: list
+    notifications: list
+    deleted: list
+
+
+def _visible_projects(user_id: int):
+    owned = select(Project.id).where(Project.owner_id == user_id, Project.deleted_at.is_(None))
+    shared = (
+        select(Membership.project_id)
+        .join(Project, Project.id == Membership.project_id)
+        .where(
+            Membership.user_id == user_id,
+            Membership.is_active.is_(True),
+            Project.active_filter(),
+        )
+    )
+    return union(owned, shared).subquery()
+
+
+def collect_changes(user_id: int, since: int | None, until: int) -> ChangeSet:
+    """Everything visible to ``user_id`` whose sync revision is in ``(since, until]``.
+
+    ``since=None`` returns the full state. Projects the user joined (or got
+    back) inside the window are returned in full, because their older tasks
+    and memberships never show up as changes.
+    """
+    visible = select(_visible_projects(user_id).c.id)
+
+    def changed(column):
+        if since is None:
+            return true()
+        return (column > since) & (column <= until)
+
+    joined = select(Membership.project_id).where(
+        Membership.user_id == user_id,
+        Membership.is_active.is_(True),
+        changed(Membership.sync_rev),
+    )
+
+    projects = db.session.execute(
+        select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.owner_id,
+            Project.archived_at,
+            Project.tasks_total,
+            Project.tasks_done,
+            Project.updated_at,
+        )
+        .where(Project.id.in_(visible), or_(changed(Project.sync_rev), Project.id.in_(joined)))
+        .order_by(Project.id)
+    ).all()
+
+    task_filter = (
+        Task.project_id.in_(visible),
+        or_(changed(Task.sync_rev), Task.project_id.in_(joined)),
+    )
+    tasks = db.session.execute(
+        select(
+            Task.id,
+            Task.project_id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.due_date,
+            Task.assigned_to_id,
+            Task.recurrence_freq,
+            Task.recurrence_interval,
+            Task.recurrence_until,
+            Task.recurrence_count,
+            Task.recurrence_parent_id,
+            Task.version,
+            Task.updated_at,
+        )
+        .where(*task_filter)
+        .order_by(Task.id)
+    ).all()
+    assignees: dict[int, list[int]] = {}
+    for task_id, member_id in db.session.execute(
+        select(task_members.c.task_id, task_members.c.user_id)
+        .join(Task, Task.id == task_members.c.task_id)
+        .where(*task_filter)
+    ):
+        assignees.setdefault(task_id, []).append(member_id)
+
+    memberships = db.session.execute(
+        select(
+            Membership.id,
+            Membership.project_id,
+            Membership.user_id,
+            User.name.label("user_name"),
+            Membership.role,
+            Membership.is_active,
+            Membership.updated_at,
+        )
+        .join(User, User.id == Membership.user_id)
+        .where(
+            Membership.project_id.in_(visible),
+            or_(changed(Membership.sync_rev), Membership.project_id.in_(joined)),
+        )
+        .order_by(Membership.id)
+    ).all()
+
+    notifications = db.session.execute(
+        select(
+            Notification.id,
+            Notification.type,
+            Notification.payload,
+            Notification.is_read,
+            Notification.created_at,
+            Notification.updated_at,
+        )
+        .where(Notification.user_id == user_id, changed(Notification.sync_rev))
+        .order_by(Notification.id)
+    ).all()
+
+    deleted = []
+    if since is not None:
+        deleted = db.session.execute(
+            select(Tombstone.entity, Tombstone.entity_id, Tombstone.project_id, Tombstone.deleted_at)
+            .where(
+                changed(Tombstone.sync_rev),
+                or_(
+                    Tombstone.user_id == user_id,
+                    Tombstone.user_id.is_(None) & Tombstone.project_id.in_(visible),
+                ),
+            )
+            .order_by(Tombstone.id)
+        ).all()
+
+    return ChangeSet(until, projects, tasks, assignees, memberships, notifications, deleted)
+
+
+def prune_tombstones(keep_days: int, now: datetime | None = None) -> int:
+    """Delete tombstones older than ``keep_days`` and return the row count.
+
+    Records the newest pruned revision, so cursors that could have missed
+    one of them get a full resync.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=keep_days)
+    expired = Tombstone.deleted_at < cutoff
+    newest = db.session.scalar(select(func.max(Tombstone.sync_rev)).where(expired))
+    result = db.session.execute(delete(Tombstone).where(expired))
+    if newest is not None:
+        db.session.execute(
+            update(SyncState)
+            .where(SyncState.id == 1, SyncState.pruned_revision < newest)
+            .values(pruned_revision=newest)
+        )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+import click
+from flask import Blueprint, abort, current_app, jsonify, request
+from flask_login import current_user, login_required
+
+from .changes import collect_changes, prune_tombstones, sync_revisions
+
+sync_bp = Blueprint("sync", __name__)
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _encode_cursor(revision: int) -> str:
+    return base64.urlsafe_b64encode(f"r{revision}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int | None:
+    """Return the cursor's revision, or None for a timestamp cursor from before revisions."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if raw.startswith("r"):
+            return int(raw[1:])
+        datetime.fromisoformat(raw)
+        return None
+    except (ValueError, UnicodeDecodeError):
+        abort(400)
+
+
+@sync_bp.route("/sync")
+@login_required
+def sync():
+    """Changes visible to the current user since ``cursor``.
+
+    Without a cursor (or with one from before the oldest kept tombstone,
+    flagged by ``reset``) the response is the full state. Clients apply
+    ``deleted`` first, upsert the rest by id, and send ``cursor`` back next
+    time. A project tombstone also removes that project's tasks, memberships
+    and notifications.
+
+    The cursor is a commit-ordered revision, not a time: every write up to
+    ``until`` has committed, however long its transaction took.
+    """
+    until, pruned = sync_revisions()
+    cursor = request.args.get("cursor")
+    since = _decode_cursor(cursor) if cursor else None
+
+    reset = cursor is not None and (since is None or since < pruned)
+    if reset:
+        since = None
+    if since is not None and since > until:
+        since = until
+
+    changes = collect_changes(current_user.id, since, until)
+    return jsonify(
+        cursor=_encode_cursor(changes.until),
+        full=since is None,
+        reset=reset,
+        projects=[
+            {
+                "id": project.id,
+                "name": project.name,
+                "description": project.description,
+                "owner_id": project.owner_id,
+                "archived_at": _iso(project.archived_at),
+                "tasks_total": project.tasks_total,
+                "tasks_done": project.tasks_done,
+                "updated_at": _iso(project.updated_at),
+            }
+            for project in changes.projects
+        ],
+        tasks=[
+            {
+                "id": task.id,
+                "project_id": task.project_id,
+                "title": task.title,
+                "description": task.description,
+                "status": task.status.value,
+                "due_date": _iso(task.due_date),
+                "assigned_to_id": task.assigned_to_id,
+                "assignee_ids": changes.assignees.get(task.id, []),
+                "recurrence": task.recurrence_freq.value if task.recurrence_freq else None,
+                "recurrence_interval": task.recurrence_interval,
+                "recurrence_until": _iso(task.recurrence_until),
+                "recurrence_count": task.recurrence_count,
+                "recurrence_parent_id": task.recurrence_parent_id,
+                "version": task.version,
+                "updated_at": _iso(task.updated_at),
+            }
+            for task in changes.tasks
+        ],
+        memberships=[
+            {
+                "id": membership.id,
+                "project_id": membership.project_id,
+                "user_id": membership.user_id,
+                "user_name": membership.user_name,
+                "role": membership.role.value,
+                "is_active": membership.is_active,
+                "updated_at": _iso(membership.updated_at),
+            }
+            for membership in changes.memberships
+        ],
+        notifications=[
+            {
+                "id": note.id,
+                "type": note.type.value,
+                "payload": note.payload,
+                "is_read": note.is_read,
+                "created_at": _iso(note.created_at),
+                "updated_at": _iso(note.updated_at),
+            }
+            for note in changes.notifications
+        ],
+        deleted=[
+            {
+                "entity": tombstone.entity.value,
+                "id": tombstone.entity_id,
+                "project_id": tombstone.project_id,
+                "deleted_at": _iso(tombstone.deleted_at),
+            }
+            for tombstone in changes.deleted
+        ],
+    )
+
+
+@sync_bp.cli.command("prune-tombstones")
+@click.option("--keep-days", type=int, default=None, help="Defaults to SYNC_TOMBSTONE_RETENTION_DAYS.")
+def prune_tombstones_command(keep_days: int | None) -> None:
+    """Delete sync tombstones older than the retention window."""
+    if keep_days is None:
+        keep_days = current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 90)
+    deleted = prune_tombstones(keep_days)
+    click.echo(f"Deleted {deleted} tombstone{'' if deleted == 1 else 's'}.")
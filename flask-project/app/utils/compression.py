@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable, Iterator
+
+from flask import Flask, Response, current_app, request
+
+try:  # Optional: br is only offered when the brotli package is installed.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+DEFAULT_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "image/svg+xml",
+    }
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        # wbits=31 selects the gzip container rather than raw zlib.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class Compress:
+    """Negotiated gzip/brotli compression applied in ``after_request``.
+
+    Buffered responses under ``COMPRESS_MIN_SIZE`` are left alone. Streamed
+    responses are compressed chunk by chunk and flushed once at least
+    ``COMPRESS_STREAM_FLUSH_SIZE`` bytes went in since the last flush. That
+    matches the board's coalesced chunks one to one, while per-row streams
+    such as NDJSON exports are not sync-flushed after every tiny line, which
+    would cost most of the compression ratio.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("COMPRESS_ENABLED", True)
+        app.config.setdefault("COMPRESS_MIN_SIZE", 500)
+        app.config.setdefault("COMPRESS_LEVEL", 6)
+        app.config.setdefault("COMPRESS_BR_LEVEL", 4)
+        app.config.setdefault("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)
+        app.config.setdefault("COMPRESS_STREAM_FLUSH_SIZE", 8192)
+        app.after_request(self.after_request)
+        app.extensions["compress"] = self
+
+    def after_request(self, response: Response) -> Response:
+        config = current_app.config
+        if not config["COMPRESS_ENABLED"] or response.mimetype not in config["COMPRESS_MIMETYPES"]:
+            return response
+        response.vary.add("Accept-Encoding")
+
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+            or request.method == "HEAD"
+        ):
+            return response
+
+        encoding = self._choose_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(
+                response.response, self._compressor(encoding), config["COMPRESS_STREAM_FLUSH_SIZE"]
+            )
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESS_MIN_SIZE"]:
+                return response
+            stream = self._compressor(encoding)
+            response.set_data(stream.process(data) + stream.finish())
+
+        response.content_encoding = encoding
+        if response.get_etag()[0]:
+            response.set_etag(response.get_etag()[0], weak=True)
+        return response
+
+    def _choose_encoding(self) -> str | None:
+        accepted = request.accept_encodings
+        if brotli is not None and accepted["br"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compressor(self, encoding: str) -> _GzipStream | _BrotliStream:
+        if encoding == "br":
+            return _BrotliStream(current_app.config["COMPRESS_BR_LEVEL"])
+        return _GzipStream(current_app.config["COMPRESS_LEVEL"])
+
+    def _stream(
+        self, chunks: Iterable[bytes | str], stream: _GzipStream | _BrotliStream, flush_size: int
+    ) -> Iterator[bytes]:
+        pending = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                data = stream.process(chunk)
+                pending += len(chunk)
+                if pending >= flush_size:
+                    data += stream.flush()
+                    pending = 0
+                if data:
+                    yield data
+            yield stream.finish()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
@@ -22,3 +22,35 @@ def send_email(subject: str, recipients: Iterable[str], body: str, html: str | N
 
     message = Message(subject=subject, recipients=list(recipients), body=body, html=html)
     mail.send(message)
+
+
+def send_bulk_email(messages: Iterable[dict]) -> None:
+    """Send many messages over a single SMTP connection.
+
+    Each item takes the same keyword arguments as :func:`send_email`.
+    """
+    messages = [message for message in messages if message.get("recipients")]
+    if not messages:
+        return
+
+    if not current_app.config.get("MAIL_USERNAME"):
+        logger.warning("MAIL_USERNAME is not configured; %d emails will be logged only.", len(messages))
+        for message in messages:
+            logger.info(
+                "Subject: %s\nRecipients: %s\nBody: %s",
+                message["subject"],
+                ", ".join(message["recipients"]),
+                message["body"],
+            )
+        return
+
+    with mail.connect() as connection:
+        for message in messages:
+            connection.send(
+                Message(
+                    subject=message["subject"],
+                    recipients=list(message["recipients"]),
+                    body=message["body"],
+                    html=message.get("html"),
+                )
+            )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import click
+from flask import Flask
+
+
+class _LazyMigrateGroup(click.Group):
+    """Stand-in ``flask db`` group that loads the real one when it is resolved."""
+
+    def __init__(self, load) -> None:
+        super().__init__(name="db", help="Perform database migrations.")
+        self._load = load
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return self._load().list_commands(ctx)
+
+    def get_command(self, ctx: click.Context, name: str) -> click.Command | None:
+        return self._load().get_command(ctx, name)
+
+
+class DeferredMigrate:
+    """Flask-Migrate without importing Alembic in every web worker.
+
+    Flask-Migrate imports all of Alembic (about a third of a second at boot)
+    but only the ``flask db`` commands use it. ``init_app`` registers a
+    placeholder group, and the first ``flask db ...`` call imports and
+    initialises the real extension.
+    """
+
+    def __init__(self) -> None:
+        self.migrate = None
+
+    def init_app(self, app: Flask, db, **kwargs) -> None:
+        def load() -> click.Group:
+            from flask_migrate import Migrate
+            from flask_migrate.cli import db as db_group
+
+            if self.migrate is None:
+                self.migrate = Migrate(app, db, **kwargs)
+            return db_group
+
+        app.cli.add_command(_LazyMigrateGroup(load))
@@ -1,22 +1,33 @@
 ﻿from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, time
+from itertools import groupby
+from operator import attrgetter
 
 from flask import current_app
+from sqlalchemy import insert, or_, select, union, update
 
 from ..extensions import db
 from ..models import (
     Invitation,
     Notification,
+    NotificationDelivery,
     NotificationType,
     Project,
     Role,
     Task,
+    User,
     task_members,
 )
+from .email import send_bulk_email
+
+
+def wants_instant_email(user) -> bool:
+    return user.notification_delivery == NotificationDelivery.INSTANT
 
 
 def notify_invitation(invitation: Invitation) -> None:
+    """Stage (without committing) the invite notification for ``invitation``."""
     reference = f"invite:{invitation.id}"
     payload = {
         "invitation_id": invitation.id,
@@ -24,6 +35,8 @@ def notify_invitation(invitation: Invitation) -> None:
         "project_name": invitation.project.name,
         "inviter_name": invitation.inviter.name,
     }
+    # Instant users get the invitation email right away; digest users later.
+    emailed_at = datetime.utcnow() if wants_instant_email(invitation.invitee) else None
     notification = Notification.query.filter_by(
         user_id=invitation.invitee_id, reference=reference
     ).first()
@@ -33,65 +46,202 @@ def notify_invitation(invitation: Invitation) -> None:
             type=NotificationType.INVITE,
             reference=reference,
             payload=payload,
+            emailed_at=emailed_at,
         )
         db.session.add(notification)
     else:
         notification.is_read = False
         notification.payload = payload
-    db.session.commit()
+        notification.emailed_at = emailed_at
 
 
-def ensure_deadline_notifications(user) -> None:
-    threshold = current_app.config.get("TASK_DEADLINE_WARNING_DAYS", 2)
+def notify_invitations(
+    invitations: list[dict], project: Project, inviter, emailed_ids: set[int] = frozenset()
+) -> None:
+    """Stage invite notifications for freshly inserted invitations in one INSERT.
+
+    ``invitations`` are ``{"id": ..., "invitee_id": ...}`` rows; new invitation
+    ids cannot have an existing notification, so no lookup is needed.
+    ``emailed_ids`` are the invitees the caller emails right away.
+    """
+    if not invitations:
+        return
     now = datetime.utcnow()
-    window_end = now + timedelta(days=threshold)
-
-    owner_tasks = (
-        Task.query.join(Project)
-        .filter(
-            Project.owner_id == user.id,
-            Task.due_date.isnot(None),
-            Task.due_date >= now,
-            Task.due_date <= window_end,
-        )
-        .all()
-    )
+    rows = [
+        {
+            "user_id": invitation["invitee_id"],
+            "type": NotificationType.INVITE,
+            "reference": f"invite:{invitation['id']}",
+            "payload": {
+                "invitation_id": invitation["id"],
+                "project_id": project.id,
+                "project_name": project.name,
+                "inviter_name": inviter.name,
+            },
+            "emailed_at": now if invitation["invitee_id"] in emailed_ids else None,
+        }
+        for invitation in invitations
+    ]
+    db.session.execute(insert(Notification), rows)
 
-    member_tasks = (
-        Task.query.join(task_members, Task.id == task_members.c.task_id)
-        .filter(
-            task_members.c.user_id == user.id,
-            Task.due_date.isnot(None),
-            Task.due_date >= now,
-            Task.due_date <= window_end,
-        )
-        .all()
+
+def _deadline_candidates(user, threshold_days: int):
+    """Tasks due soon that ``user`` owns or is assigned to, in one UNION query.
+
+    Both branches filter on ``Task.is_due_soon`` so each range scan runs over
+    the open-tasks ``(due_date, id)`` index; UNION drops tasks matched twice.
+    """
+    columns = (
+        Task.id,
+        Task.project_id,
+        Task.title,
+        Task.due_date,
+        Project.name.label("project_name"),
+    )
+    owned = (
+        select(*columns)
+        .join(Project, Project.id == Task.project_id)
+        .where(Project.owner_id == user.id, Project.active_filter(), Task.is_due_soon(threshold_days))
     )
+    assigned = (
+        select(*columns)
+        .join(task_members, task_members.c.task_id == Task.id)
+        .join(Project, Project.id == Task.project_id)
+        .where(task_members.c.user_id == user.id, Project.active_filter(), Task.is_due_soon(threshold_days))
+    )
+    return db.session.execute(union(owned, assigned)).all()
+
 
-    relevant_tasks = {task.id: task for task in owner_tasks + member_tasks}
+def ensure_deadline_notifications(user) -> int:
+    """Stage deadline notifications for ``user`` and return how many changed.
+
+    Nothing is committed; callers only need a transaction when this is non-zero.
+    """
+    threshold = current_app.config.get("TASK_DEADLINE_WARNING_DAYS", 2)
+    candidates = _deadline_candidates(user, threshold)
+    if not candidates:
+        return 0
+
+    references = {f"deadline:{task.id}:{user.id}": task for task in candidates}
+    existing = {
+        notification.reference: notification
+        for notification in Notification.query.filter(
+            Notification.user_id == user.id,
+            Notification.reference.in_(references),
+        )
+    }
 
-    for task in relevant_tasks.values():
-        reference = f"deadline:{task.id}:{user.id}"
+    changed = 0
+    for reference, task in references.items():
         payload = {
             "task_id": task.id,
             "project_id": task.project_id,
             "task_title": task.title,
-            "due": task.due_date.isoformat() if task.due_date else None,
-            "project_name": task.project.name,
+            "due": task.due_date.isoformat(),
+            "project_name": task.project_name,
         }
-        notification = Notification.query.filter_by(
-            user_id=user.id, reference=reference
-        ).first()
+        notification = existing.get(reference)
         if not notification:
-            notification = Notification(
-                user_id=user.id,
-                type=NotificationType.DEADLINE,
-                reference=reference,
-                payload=payload,
+            db.session.add(
+                Notification(
+                    user_id=user.id,
+                    type=NotificationType.DEADLINE,
+                    reference=reference,
+                    payload=payload,
+                )
             )
-            db.session.add(notification)
-        else:
+            changed += 1
+        elif notification.payload != payload or notification.is_read:
+            if notification.payload != payload:
+                notification.emailed_at = None
             notification.payload = payload
             notification.is_read = False
+            changed += 1
+
+    return changed
+
+
+DIGEST_SECTIONS = {
+    NotificationType.DEADLINE: "Upcoming deadlines",
+    NotificationType.INVITE: "Project invitations",
+}
+
+
+def send_digests(now: datetime | None = None, batch_size: int = 200) -> int:
+    """Email every digest user their pending notifications; return the email count.
+
+    Users are walked in id batches and each user gets at most one digest per
+    UTC day. For each batch, deadline notifications are refreshed, all
+    pending rows are read in one query sorted by user and type, and the
+    emails go out over a single SMTP connection. Rows are only marked as
+    emailed after their batch was sent, so a failed run retries them.
+    """
+    now = now or datetime.utcnow()
+    day_start = datetime.combine(now.date(), time.min)
+    template = current_app.jinja_env.get_template("email/digest.txt")
+    sent = 0
+    last_id = 0
+
+    while True:
+        users = db.session.execute(
+            select(User.id, User.email, User.name)
+            .where(
+                User.id > last_id,
+                User.is_active.is_(True),
+                User.notification_delivery == NotificationDelivery.DIGEST,
+                or_(User.last_digest_at.is_(None), User.last_digest_at < day_start),
+            )
+            .order_by(User.id)
+            .limit(batch_size)
+        ).all()
+        if not users:
+            break
+        last_id = users[-1].id
+        user_ids = [user.id for user in users]
+
+        for user in users:
+            ensure_deadline_notifications(user)
+        db.session.flush()
+
+        pending = db.session.execute(
+            select(Notification.id, Notification.user_id, Notification.type, Notification.payload)
+            .where(
+                Notification.user_id.in_(user_ids),
+                Notification.emailed_at.is_(None),
+                Notification.is_read.is_(False),
+            )
+            .order_by(Notification.user_id, Notification.type, Notification.id)
+        ).all()
+        by_user = {user_id: list(rows) for user_id, rows in groupby(pending, attrgetter("user_id"))}
+
+        messages = []
+        for user in users:
+            rows = by_user.get(user.id)
+            if not rows:
+                continue
+            sections = [
+                (DIGEST_SECTIONS[type_], [row.payload for row in items])
+                for type_, items in groupby(rows, attrgetter("type"))
+            ]
+            messages.append(
+                {
+                    "subject": f"Your daily summary: {len(rows)} update{'' if len(rows) == 1 else 's'}",
+                    "recipients": [user.email],
+                    "body": template.render(user=user, sections=sections),
+                }
+            )
+        send_bulk_email(messages)
+
+        if pending:
+            db.session.execute(
+                update(Notification)
+                .where(Notification.id.in_([row.id for row in pending]))
+                .values(emailed_at=now)
+            )
+        db.session.execute(
+            update(User).where(User.id.in_(user_ids)).values(last_digest_at=now)
+        )
+        db.session.commit()
+        sent += len(messages)
 
-    db.session.commit()
+    return sent
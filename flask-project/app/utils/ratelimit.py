@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable
+
+from flask import Flask, make_response, request
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitStore(ABC):
+    """Counter storage shared by every worker that should see the same limits.
+
+    Implementations only need atomic increment-with-expiry and a read, which maps
+    directly onto Redis ``INCR``/``EXPIRE`` or memcached ``incr``/``add``.
+    """
+
+    @abstractmethod
+    def incr(self, key: str, ttl: float) -> int:
+        """Atomically add one to ``key`` and return the new count."""
+
+    @abstractmethod
+    def get(self, key: str) -> int:
+        """Return the current count of ``key``, or 0 once it expired."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Process-local store; a stand-in for a shared backend on single-node setups."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._next_prune = 0.0
+
+    def incr(self, key: str, ttl: float) -> int:
+        now = self._clock()
+        with self._lock:
+            self._prune(now)
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + ttl
+            count += 1
+            self._counters[key] = (count, expires_at)
+            return count
+
+    def get(self, key: str) -> int:
+        now = self._clock()
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            return count if expires_at > now else 0
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        expired = [key for key, (_, expires_at) in self._counters.items() if expires_at <= now]
+        for key in expired:
+            del self._counters[key]
+        self._next_prune = now + 60
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: int = 0
+
+
+class RateLimiter:
+    """Sliding-window counter limiter.
+
+    Each window keeps one counter per fixed bucket; the effective count is the
+    current bucket plus the previous bucket weighted by how much of it still
+    overlaps the sliding window. That needs one read and one atomic increment
+    per check.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.store: RateLimitStore = MemoryRateLimitStore()
+        self.enabled = True
+        self.limits: dict[str, tuple[int, int]] = {}
+        self._clock: Callable[[], float] = time.time
+        self._metrics: Counter[str] = Counter()
+        self._metrics_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        store = app.config.get("RATELIMIT_STORE")
+        if isinstance(store, str):
+            store = import_string(store)
+        if isinstance(store, type):
+            store = store()
+        if store is not None:
+            self.store = store
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        self.limits = dict(app.config.get("RATELIMIT_LIMITS", {}))
+        app.extensions["ratelimiter"] = self
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = self._clock()
+        bucket = math.floor(now / window)
+        elapsed = now / window - bucket
+        previous = self.store.get(f"rl:{key}:{bucket - 1}")
+        # Count the attempt first and decide on the store's answer: checking
+        # before incrementing would let concurrent attempts all pass the check.
+        current = self.store.incr(f"rl:{key}:{bucket}", ttl=window * 2)
+
+        weighted = previous * (1 - elapsed) + current
+        if weighted > limit:
+            return RateLimitResult(False, max(1, math.ceil((1 - elapsed) * window)))
+        return RateLimitResult(True)
+
+    def check(self, scope: str, **keys: str | None) -> RateLimitResult:
+        """Record one attempt for every non-empty key under ``scope``.
+
+        Limits are looked up as ``"<scope>.<key name>"`` in ``RATELIMIT_LIMITS``.
+        The first exhausted key rejects the request without counting it against
+        the remaining keys.
+        """
+        for name, value in keys.items():
+            limit = self.limits.get(f"{scope}.{name}")
+            if not value or not limit:
+                continue
+            result = self.hit(f"{scope}:{name}:{value}", *limit)
+            if not result.allowed:
+                self._record(scope, "rejected")
+                logger.info("Rate limit exceeded for %s (%s).", scope, name)
+                return result
+        self._record(scope, "allowed")
+        return RateLimitResult(True)
+
+    def limit(self, scope: str, methods: tuple[str, ...] = ("POST",), **key_funcs: Callable[[], str | None]):
+        """Reject over-limit requests before the view does any database or hashing work."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                if self.enabled and request.method in methods:
+                    keys = {name: func() for name, func in key_funcs.items()}
+                    result = self.check(scope, **keys)
+                    if not result.allowed:
+                        response = make_response(
+                            "Too many attempts. Please wait a moment and try again.", 429
+                        )
+                        response.headers["Retry-After"] = str(result.retry_after)
+                        return response
+                return view(*args, **kwargs)
+
+            return wrapped
+
+        return decorator
+
+    def metrics(self) -> dict[str, int]:
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def _record(self, scope: str, outcome: str) -> None:
+        with self._metrics_lock:
+            self._metrics[f"{scope}.{outcome}"] += 1
+
+
+def client_ip() -> str | None:
+    return request.remote_addr
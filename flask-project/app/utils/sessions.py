@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any, Callable
+
+from flask import Flask, current_app, session
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from itsdangerous import BadSignature, Signer
+from werkzeug.utils import import_string
+
+
+class SessionStore(ABC):
+    """Key/value storage for serialized sessions, shared by every worker.
+
+    Values are strings with a time-to-live, which maps directly onto Redis
+    ``GET``/``SETEX``/``DEL`` or memcached ``get``/``set``/``delete``.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        """Return the value of ``key``, or None once it expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key``; missing keys are ignored."""
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store for a single worker process.
+
+    Each worker gets its own copy, so with several workers a user is signed
+    out whenever a request lands on another one. Select it explicitly with
+    ``SESSION_STORE`` only when the app runs in one process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values: dict[str, tuple[str, float]] = {}
+        self._next_prune = 0.0
+
+    def get(self, key: str) -> str | None:
+        now = self._clock()
+        with self._lock:
+            value, expires_at = self._values.get(key, (None, 0.0))
+            return value if expires_at > now else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = self._clock()
+        with self._lock:
+            self._prune(now)
+            self._values[key] = (value, now + ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        expired = [key for key, (_, expires_at) in self._values.items() if expires_at <= now]
+        for key in expired:
+            del self._values[key]
+        self._next_prune = now + 60
+
+
+class ServerSideSession(SessionMixin):
+    """Session whose data stays in the store; the cookie only carries its id.
+
+    Nothing is fetched until the view first reads or writes a key, so requests
+    that never touch the session never hit the store.
+    """
+
+    def __init__(self, sid: str | None, loader: Callable[[], dict[str, Any]]) -> None:
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+        self.accessed = False
+        self.regenerated_from: str | None = None
+        self._loader = loader
+        self._data: dict[str, Any] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> dict[str, Any]:
+        self.accessed = True
+        if self._data is None:
+            self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self.modified = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def regenerate(self) -> None:
+        """Move the data to a fresh id, e.g. after login, to defeat session fixation."""
+        self.data  # load under the old id before it is dropped
+        if self.sid is not None and self.regenerated_from is None:
+            self.regenerated_from = self.sid
+        self.sid = None
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Stores session data server-side and writes only when it changed.
+
+    The cookie holds a signed random id and is only sent when the id is new or
+    the session is emptied, instead of re-signing the whole payload on most
+    responses.
+    """
+
+    serializer = session_json_serializer
+    key_prefix = "session:"
+    user_prefix = "session-user:"
+
+    def __init__(self, store: SessionStore) -> None:
+        self.store = store
+
+    def _signer(self, app: Flask) -> Signer | None:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt="server-side-session")
+
+    def _ttl(self, app: Flask) -> float:
+        return app.permanent_session_lifetime.total_seconds()
+
+    def _load(self, sid: str) -> dict[str, Any]:
+        raw = self.store.get(self.key_prefix + sid)
+        return dict(self.serializer.loads(raw)) if raw else {}
+
+    def open_session(self, app: Flask, request) -> ServerSideSession | None:
+        signer = self._signer(app)
+        if signer is None:
+            return None
+        sid = None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = signer.unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+        if sid is None:
+            return ServerSideSession(None, dict)
+        return ServerSideSession(sid, lambda: self._load(sid))
+
+    def save_session(self, app: Flask, session: ServerSideSession, response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if session.regenerated_from:
+            self.store.delete(self.key_prefix + session.regenerated_from)
+
+        if not session.modified:
+            return
+
+        if not session.loaded or not session:
+            if session.sid is not None:
+                self.store.delete(self.key_prefix + session.sid)
+            if not session.new or session.regenerated_from:
+                response.delete_cookie(
+                    name,
+                    domain=domain,
+                    path=path,
+                    secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app),
+                    httponly=self.get_cookie_httponly(app),
+                )
+            return
+
+        issue_cookie = session.sid is None or session.permanent
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+
+        ttl = self._ttl(app)
+        self.store.set(self.key_prefix + session.sid, self.serializer.dumps(dict(session)), ttl)
+        user_id = session.get("_user_id")
+        if user_id:
+            self._remember_sid(user_id, session.sid, ttl)
+
+        if issue_cookie:
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid.encode()).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+    def _user_sids(self, user_id) -> list[str]:
+        raw = self.store.get(f"{self.user_prefix}{user_id}")
+        return list(self.serializer.loads(raw)) if raw else []
+
+    def _remember_sid(self, user_id, sid: str, ttl: float) -> None:
+        sids = self._user_sids(user_id)
+        if sid not in sids:
+            live = [known for known in sids if self.store.get(self.key_prefix + known)]
+            self.store.set(f"{self.user_prefix}{user_id}", self.serializer.dumps([*live, sid]), ttl)
+
+    def revoke(self, sid: str) -> None:
+        self.store.delete(self.key_prefix + sid)
+
+    def revoke_user(self, app: Flask, user_id, keep: str | None = None) -> int:
+        """Delete every stored session of ``user_id`` except ``keep``; return the count."""
+        revoked = 0
+        for sid in self._user_sids(user_id):
+            if sid != keep:
+                self.revoke(sid)
+                revoked += 1
+        remaining = [keep] if keep else []
+        self.store.set(f"{self.user_prefix}{user_id}", self.serializer.dumps(remaining), self._ttl(app))
+        return revoked
+
+
+class ServerSideSessions:
+    """Installs :class:`ServerSideSessionInterface` when ``SESSION_SERVER_SIDE`` is on."""
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.interface: ServerSideSessionInterface | None = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get("SESSION_SERVER_SIDE", False):
+            return
+        store = app.config.get("SESSION_STORE")
+        if not store:
+            # A silent per-process fallback loses logins, 2FA state and CSRF
+            # tokens as soon as a second worker serves the user.
+            raise RuntimeError(
+                "SESSION_SERVER_SIDE needs a SESSION_STORE shared by every worker "
+                "(app.utils.sessions:MemorySessionStore only for a single process)."
+            )
+        if isinstance(store, str):
+            store = import_string(store)
+        if isinstance(store, type):
+            store = store()
+        self.interface = ServerSideSessionInterface(store)
+        app.session_interface = self.interface
+        app.extensions["server_sessions"] = self
+
+    def regenerate(self) -> None:
+        """Give the current session a new id; a no-op with cookie sessions."""
+        if isinstance(session._get_current_object(), ServerSideSession):
+            session.regenerate()
+
+    def revoke_user(self, user_id, keep_current: bool = False) -> int:
+        """Sign ``user_id`` out everywhere, optionally keeping the calling session."""
+        if self.interface is None:
+            return 0
+        current = session._get_current_object()
+        keep = current.sid if keep_current and isinstance(current, ServerSideSession) else None
+        return self.interface.revoke_user(current_app, user_id, keep=keep)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+from jinja2 import BytecodeCache, FileSystemBytecodeCache
+from werkzeug.utils import import_string
+
+templates_cli = AppGroup("templates", help="Template cache commands.")
+
+
+class TemplateCache:
+    """Jinja bytecode cache shared across worker restarts.
+
+    ``TEMPLATE_BYTECODE_CACHE`` selects the backend: ``"filesystem"`` (the
+    default, under ``TEMPLATE_CACHE_DIR``), ``"none"``, or an import path to
+    any :class:`jinja2.BytecodeCache` subclass, such as a memcached-backed
+    cache shared by every node. Entries are keyed by template source checksum,
+    so a deploy that changes a template never serves stale bytecode.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        backend = app.config.get("TEMPLATE_BYTECODE_CACHE", "filesystem")
+        if backend and backend != "none":
+            app.jinja_env.bytecode_cache = self._make_cache(app, backend)
+        app.cli.add_command(templates_cli)
+        app.extensions["template_cache"] = self
+
+    def _make_cache(self, app: Flask, backend) -> BytecodeCache:
+        if isinstance(backend, BytecodeCache):
+            return backend
+        if backend == "filesystem":
+            directory = Path(app.config.get("TEMPLATE_CACHE_DIR") or Path(app.instance_path, "jinja_cache"))
+            directory.mkdir(parents=True, exist_ok=True)
+            return FileSystemBytecodeCache(str(directory), pattern="__flask_todo_%s.cache")
+        if isinstance(backend, str):
+            backend = import_string(backend)
+        return backend()
+
+
+def precompile_templates(app: Flask) -> list[str]:
+    """Compile every template once, filling the bytecode cache; return their names."""
+    names = app.jinja_env.list_templates(filter_func=lambda name: not name.startswith("."))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return names
+
+
+@templates_cli.command("compile")
+def compile_command() -> None:
+    """Compile all templates into the bytecode cache (run at deploy time)."""
+    app = current_app._get_current_object()
+    if app.jinja_env.bytecode_cache is None:
+        raise click.ClickException("TEMPLATE_BYTECODE_CACHE is disabled.")
+    started = time.perf_counter()
+    names = precompile_templates(app)
+    click.echo(f"Compiled {len(names)} templates in {time.perf_counter() - started:.2f}s.")
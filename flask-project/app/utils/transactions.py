@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy.orm import SessionTransaction
+
+from ..extensions import db
+
+
+@contextmanager
+def unit_of_work() -> Iterator[None]:
+    """Commit everything staged inside the block once, or roll it all back.
+
+    Helpers such as those in :mod:`app.utils.notifications` only add to the
+    session; the view wraps them in a single unit of work so a request costs
+    one write transaction (one fsync on SQLite) instead of one per helper.
+    """
+    try:
+        yield
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+@contextmanager
+def savepoint() -> Iterator[SessionTransaction]:
+    """Run the block in a SAVEPOINT so a failure undoes only its own changes.
+
+    The exception is re-raised after the savepoint is rolled back; callers that
+    want to continue the outer unit of work catch it around the ``with``.
+    """
+    with db.session.begin_nested() as nested:
+        yield nested
@@ -7,6 +7,14 @@ STRINGS = {
     "nav_logout": "Sign Out",
     "nav_profile": "My Profile",
     "nav_projects": "Projects",
+    "nav_my_tasks": "My Tasks",
+    "my_tasks_empty": "Nothing assigned to you here.",
+    "my_tasks_all": "All",
+    "my_tasks_window_overdue": "Overdue",
+    "my_tasks_window_today": "Next 24h",
+    "my_tasks_window_week": "Next 7 days",
+    "my_tasks_window_month": "Next 30 days",
+    "my_tasks_more": "Load more",
     "home_welcome": "Welcome back, {name}!",
     "home_no_projects": "You don't have any projects yet.",
     "home_create_project": "Create Project",
@@ -25,6 +33,12 @@ STRINGS = {
     "task_delete": "Delete",
     "task_due": "Due {date}",
     "task_unassigned": "Unassigned",
+    "task_repeat": "Repeat",
+    "task_repeat_every": "Every (periods)",
+    "task_repeat_until": "Repeat until",
+    "task_repeat_count": "Occurrences",
+    "task_repeats": "Recurring task",
+    "task_waits_on": "Waits on unfinished tasks",
     "task_title": "Task Title",
     "status_todo": "To do",
     "status_in_progress": "In progress",
@@ -36,6 +50,8 @@ STRINGS = {
     "profile_save": "Save",
     "profile_upload": "Upload",
     "profile_update_password": "Update Password",
+    "profile_notifications_label": "Notifications",
+    "profile_notifications_hint": "Get an email for every invitation, or one daily summary of invitations and upcoming deadlines.",
     "notifications_title": "Notifications",
     "notifications_empty": "You're all caught up!",
     "notification_invite": "{inviter} invited you to join {project}.",
@@ -61,6 +77,12 @@ STRINGS = {
     "project_members": "Team",
     "project_invite": "Invite member",
     "project_members_empty": "No members yet",
+    "project_archive": "Archive",
+    "project_archived": "Archived",
+    "project_restore": "Restore",
+    "project_bulk_invite": "Invite several people (comma or line separated)",
+    "project_bulk_invite_csv": "Or upload a CSV of emails",
+    "project_bulk_invite_cta": "Invite all",
     "deadline_label": "Deadline",
     "status_label": "Status",
     "assignee_label": "Assignee",
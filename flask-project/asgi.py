@@ -0,0 +1,15 @@
+"""ASGI entry point.
+
+Run with ``uvicorn asgi:app --workers 4``. Slow clients and slow request
+bodies are handled by the event loop, and the Flask app itself runs on a
+per-process thread pool sized by ``ASGI_THREADS``. A worker no longer sits
+idle while one request waits on SMTP or the database.
+"""
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from app.config import ProductionConfig
+
+flask_app = create_app(ProductionConfig)
+app = WSGIMiddleware(flask_app, workers=flask_app.config["ASGI_THREADS"])
@@ -0,0 +1,147 @@
+"""Compare chart reads from the daily rollups against scanning task history.
+
+Seeds one project with ``--tasks`` tasks whose creation and status moves
+are spread over ``--days`` days of activity log, rolls the history up, then
+reports the nightly one-day roll-up, a full rebuild, and a 90-day cumulative
+flow series read from the rollup rows versus replayed from the log::
+
+    python -m benchmarks.analytics --tasks 20000 --days 180
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def _seed(tasks: int, days: int, today) -> int:
+    from sqlalchemy import insert, update
+
+    from app.extensions import db
+    from app.models import ActivityAction, ActivityLog, Project, Task, TaskStatus, User
+    from app.projects.activity import activity_bucket
+
+    owner = User(email="bench@example.com", name="Bench Owner", is_verified=True)
+    owner.set_password("benchmark")
+    project = Project(name="Bench", owner=owner)
+    db.session.add(project)
+    db.session.commit()
+
+    rng = random.Random(42)
+    start = datetime.combine(today, datetime.min.time()) - timedelta(days=days)
+    statuses, entries = [], []
+    for task_id in range(1, tasks + 1):
+        moment = start + timedelta(seconds=rng.randrange(days * 86400))
+        path = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.DONE][: rng.randint(1, 3)]
+        previous = None
+        for status in path:
+            entries.append(
+                {
+                    "project_id": project.id,
+                    "task_id": task_id,
+                    "task_title": f"Task {task_id}",
+                    "action": ActivityAction.CREATED if previous is None else ActivityAction.MOVED,
+                    "changes": {"status": [previous and previous.value, status.value]},
+                    "bucket": activity_bucket(moment),
+                    "created_at": moment,
+                }
+            )
+            previous = status
+            moment += timedelta(hours=rng.randrange(1, 24 * 7))
+        statuses.append(previous)
+
+    db.session.execute(
+        insert(Task),
+        [
+            {"project_id": project.id, "title": f"Task {index}", "status": status, "created_by_id": owner.id}
+            for index, status in enumerate(statuses)
+        ],
+    )
+    entries.sort(key=lambda entry: entry["created_at"])
+    db.session.execute(insert(ActivityLog), entries)
+    counts = Counter(statuses)
+    db.session.execute(
+        update(Project)
+        .where(Project.id == project.id)
+        .values(
+            tasks_total=tasks,
+            tasks_todo=counts[TaskStatus.TODO],
+            tasks_in_progress=counts[TaskStatus.IN_PROGRESS],
+            tasks_done=counts[TaskStatus.DONE],
+        )
+    )
+    db.session.commit()
+    return project.id
+
+
+def _replayed_flow(project_id: int, days: int, today) -> list[tuple]:
+    """What a chart would cost without rollups: replay the whole log."""
+    from sqlalchemy import select
+
+    from app.extensions import db
+    from app.models import ActivityLog
+
+    counts = Counter()
+    series = {}
+    first = today - timedelta(days=days)
+    for changes, created_at in db.session.execute(
+        select(ActivityLog.changes, ActivityLog.created_at)
+        .where(ActivityLog.project_id == project_id)
+        .order_by(ActivityLog.created_at)
+    ):
+        old, new = (changes.get("status") or (None, None))
+        counts[old] -= old is not None
+        counts[new] += new is not None
+        day = created_at.date()
+        if first <= day < today:
+            series[day] = (day, counts["todo"], counts["in_progress"], counts["done"])
+    return list(series.values())
+
+
+def _time(call, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp, 'bench.db').as_posix()}"
+        from app import create_app
+        from app.extensions import db
+        from app.projects.analytics import daily_series, roll_up
+
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            today = datetime.utcnow().date()
+            project_id = _seed(args.tasks, args.days, today)
+            yesterday = today - timedelta(days=1)
+
+            rebuild = _time(lambda: roll_up(today - timedelta(days=args.days), yesterday))
+            nightly = _time(lambda: roll_up(yesterday), args.repeat)
+            rows = _time(lambda: daily_series(project_id, 90), args.repeat)
+            replay = _time(lambda: _replayed_flow(project_id, 90, today), args.repeat)
+
+            print(f"{args.tasks} tasks over {args.days} days")
+            print(f"rebuild all days   {rebuild * 1000:8.1f} ms")
+            print(f"nightly roll-up    {nightly * 1000:8.1f} ms")
+            print(f"90-day flow, rows  {rows * 1000:8.2f} ms")
+            print(f"90-day flow, log   {replay * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
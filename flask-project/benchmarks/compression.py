@@ -0,0 +1,90 @@
+"""Bytes-on-wire and CPU cost of response compression on a large project board.
+
+Seeds an in-memory database with one project of ``--tasks`` tasks and renders
+``projects.detail`` through the test client. Wire size is measured end to end
+for each encoding. The compression CPU cost is timed on its own, since the
+page render time would otherwise swamp it. gzip is tried at several levels,
+and brotli when it is installed::
+
+    python -m benchmarks.compression --tasks 2000 --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+
+def _seed(app, task_count: int) -> None:
+    from app.extensions import db
+    from app.models import Membership, Project, Role, Task, TaskStatus, User
+
+    with app.app_context():
+        db.create_all()
+        user = User(email="bench@example.com", name="Bench User", is_verified=True)
+        user.set_password("benchmark")
+        db.session.add(user)
+        db.session.flush()
+        project = Project(name="Benchmark board", owner_id=user.id)
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(Membership(user_id=user.id, project_id=project.id, role=Role.OWNER))
+        statuses = list(TaskStatus)
+        db.session.add_all(
+            Task(
+                project_id=project.id,
+                title=f"Task {index}",
+                description="Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+                status=statuses[index % len(statuses)],
+                created_by_id=user.id,
+            )
+            for index in range(task_count)
+        )
+        db.session.commit()
+
+
+def _compress_cpu_ms(body: bytes, stream_factory, rounds: int) -> float:
+    started = time.process_time()
+    for _ in range(rounds):
+        stream = stream_factory()
+        stream.process(body)
+        stream.finish()
+    return (time.process_time() - started) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20, help="compression repetitions per case")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite://"
+    from app import create_app
+
+    app = create_app()
+    _seed(app, args.tasks)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+
+    from app.utils.compression import _BrotliStream, _GzipStream, brotli
+
+    app.config["COMPRESS_ENABLED"] = False
+    body = client.get("/projects/1").get_data()
+    print(f"{'identity':<9} {len(body):>9,} bytes")
+
+    cases = [(f"gzip-{level}", "gzip", lambda level=level: _GzipStream(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        cases += [(f"br-{q}", "br", lambda q=q: _BrotliStream(q)) for q in (4, 11)]
+
+    app.config["COMPRESS_ENABLED"] = True
+    for label, encoding, factory in cases:
+        app.config["COMPRESS_LEVEL" if encoding == "gzip" else "COMPRESS_BR_LEVEL"] = int(label.split("-")[1])
+        size = len(client.get("/projects/1", headers={"Accept-Encoding": encoding}).get_data())
+        cpu_ms = _compress_cpu_ms(body, factory, args.rounds)
+        print(f"{label:<9} {size:>9,} bytes  {size / len(body):6.1%}  {cpu_ms:6.2f} ms CPU/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Compare threaded gunicorn workers against the ASGI entry point under I/O-bound load.
+
+Each server gets the same number of processes and the same number of threads
+per process (gunicorn's ``gthread`` worker and the ASGI thread pool), so the
+comparison is of the serving model rather than of the thread count. The app
+gets an extra ``/__bench/io`` route that sleeps for ``--delay`` seconds,
+standing in for an SMTP send or a slow database wait. N concurrent clients
+then hammer that route, and the script reports throughput and latency
+percentiles for each server::
+
+    python -m benchmarks.concurrency --workers 2 --threads 32 --clients 64 --delay 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _bench_flask_app():
+    from app import create_app
+
+    app = create_app()
+    delay = float(os.environ.get("BENCH_IO_DELAY", "0.2"))
+
+    @app.route("/__bench/io")
+    def bench_io():
+        time.sleep(delay)
+        return "ok"
+
+    return app
+
+
+def wsgi_app():
+    return _bench_flask_app()
+
+
+def asgi_app():
+    from a2wsgi import WSGIMiddleware
+
+    app = _bench_flask_app()
+    return WSGIMiddleware(app, workers=app.config["ASGI_THREADS"])
+
+
+SERVERS = {
+    "gunicorn-gthread": lambda port, workers, threads: [
+        sys.executable, "-m", "gunicorn", "-k", "gthread", "-w", str(workers),
+        "--threads", str(threads), "-b", f"127.0.0.1:{port}", "benchmarks.concurrency:wsgi_app()",
+    ],
+    # The thread pool size reaches asgi_app() through ASGI_THREADS.
+    "uvicorn-asgi": lambda port, workers, threads: [
+        sys.executable, "-m", "uvicorn", "--factory", "--workers", str(workers),
+        "--port", str(port), "--log-level", "warning", "benchmarks.concurrency:asgi_app",
+    ],
+}
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def _fetch(url: str) -> float:
+    started = time.perf_counter()
+    urllib.request.urlopen(url, timeout=60).read()
+    return time.perf_counter() - started
+
+
+def run(server: str, args: argparse.Namespace, env: dict[str, str]) -> dict[str, float]:
+    url = f"http://127.0.0.1:{args.port}/__bench/io"
+    command = SERVERS[server](args.port, args.workers, args.threads)
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    try:
+        _wait_ready(url)
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            started = time.perf_counter()
+            latencies = sorted(pool.map(_fetch, [url] * args.requests))
+            elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "req_per_s": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=32, help="Threads per worker, for both servers.")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp, 'bench.db').as_posix()}",
+            "BENCH_IO_DELAY": str(args.delay),
+            "ASGI_THREADS": str(args.threads),
+        }
+        for server in SERVERS:
+            result = run(server, args, env)
+            print(
+                f"{server:<16} {result['req_per_s']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
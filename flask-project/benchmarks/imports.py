@@ -0,0 +1,69 @@
+"""Report the slowest imports behind ``create_app``.
+
+Runs ``python -X importtime`` in a fresh interpreter that builds the app and
+prints the modules with the largest cumulative import time, plus any
+deferred dependency that loaded anyway. tests/test_import_budget.py keeps
+the deferred ones out of the boot path::
+
+    python -m benchmarks.imports --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BOOT = "from app import create_app; create_app()"
+
+# Only needed by specific pages or commands; they must never load at boot.
+DEFERRED = ("qrcode", "PIL", "pyotp", "flask_migrate", "alembic")
+
+
+def measure() -> list[tuple[str, int, int, int]]:
+    """Return ``(module, self_us, cumulative_us, depth)`` for every import."""
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = measure()
+    # Top-level entries already include everything they imported.
+    total_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+
+    print(f"{'module':<40} {'self ms':>8} {'cumul ms':>9}")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[: args.top]:
+        print(f"{name:<40} {self_us / 1000:8.1f} {cumulative_us / 1000:9.1f}")
+
+    loaded = {name for name, *_ in rows}
+    eager = [name for name in DEFERRED if name in loaded]
+    print(f"\ntotal import time {total_ms:.1f} ms")
+    if eager:
+        print(f"imported at boot but should be deferred: {', '.join(eager)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Compare ORM entities against read-model rows for large list views.
+
+Seeds one project with ``--rows`` tasks and as many notifications, then loads
+each list both ways (full ORM objects through the session, and the
+column-selected rows from ``app.read_models``) and reports wall time and peak
+traced memory::
+
+    python -m benchmarks.read_models --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def _seed(rows: int) -> tuple[int, int]:
+    from sqlalchemy import insert
+
+    from app.extensions import db
+    from app.models import Notification, NotificationType, Project, Task, TaskStatus, User, task_members
+
+    db.create_all()
+    owner = User(email="bench@example.com", name="Bench Owner", is_verified=True)
+    owner.set_password("benchmark")
+    project = Project(name="Bench", owner=owner)
+    db.session.add(project)
+    db.session.commit()
+
+    statuses = list(TaskStatus)
+    db.session.execute(
+        insert(Task),
+        [
+            {
+                "project_id": project.id,
+                "title": f"Task {index}",
+                "description": "Lorem ipsum dolor sit amet " * 3,
+                "status": statuses[index % len(statuses)],
+                "created_by_id": owner.id,
+                "assigned_to_id": owner.id,
+            }
+            for index in range(rows)
+        ],
+    )
+    db.session.execute(
+        insert(task_members),
+        [{"task_id": task_id, "user_id": owner.id} for task_id in range(1, rows + 1)],
+    )
+    db.session.execute(
+        insert(Notification),
+        [
+            {
+                "user_id": owner.id,
+                "type": NotificationType.DEADLINE,
+                "payload": {"task_title": f"Task {index}", "project_id": project.id},
+            }
+            for index in range(rows)
+        ],
+    )
+    db.session.commit()
+    return owner.id, project.id
+
+
+def _measure(load) -> tuple[float, float, int]:
+    """Time one untraced run, then trace a second run for peak memory."""
+    from app.extensions import db
+
+    db.session.expunge_all()
+    gc.collect()
+    started = time.perf_counter()
+    count = load()
+    elapsed = time.perf_counter() - started
+
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return elapsed, peak, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp, 'bench.db').as_posix()}"
+        from sqlalchemy.orm import selectinload
+
+        from app import create_app
+        from app.models import Notification, Task, TaskStatus
+        from app.read_models import notification_rows, project_members, task_cards
+
+        app = create_app()
+        with app.app_context():
+            user_id, project_id = _seed(args.rows)
+
+            def orm_board() -> int:
+                return sum(
+                    len(
+                        Task.query.filter_by(project_id=project_id, status=status)
+                        .options(selectinload(Task.assignees))
+                        .order_by(Task.due_date.asc().nulls_last(), Task.created_at.asc())
+                        .yield_per(args.batch)
+                        .all()
+                    )
+                    for status in TaskStatus
+                )
+
+            def row_board() -> int:
+                members = project_members(project_id, user_id)
+                return sum(
+                    len(list(task_cards(project_id, status, members, args.batch)))
+                    for status in TaskStatus
+                )
+
+            def orm_inbox() -> int:
+                return len(
+                    Notification.query.filter_by(user_id=user_id)
+                    .order_by(Notification.created_at.desc())
+                    .all()
+                )
+
+            def row_inbox() -> int:
+                return len(notification_rows(user_id))
+
+            cases = {
+                "board (ORM)": orm_board,
+                "board (rows)": row_board,
+                "inbox (ORM)": orm_inbox,
+                "inbox (rows)": row_inbox,
+            }
+            for label, load in cases.items():
+                elapsed, peak, count = _measure(load)
+                print(f"{label:<14} {count:6d} rows  {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
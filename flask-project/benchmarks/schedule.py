@@ -0,0 +1,108 @@
+"""Time the dependency schedule cold, cached, and after an invalidating edit.
+
+Seeds one project with ``--tasks`` tasks, each waiting on up to
+``--fanin`` earlier ones, then reports how long ``get_schedule`` takes when
+it has to walk the graph and when it can answer from the revision-checked
+cache::
+
+    python -m benchmarks.schedule --tasks 5000 --fanin 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def _seed(tasks: int, fanin: int) -> int:
+    from sqlalchemy import insert
+
+    from app.extensions import db
+    from app.models import Project, Task, TaskStatus, User, task_dependencies
+
+    owner = User(email="bench@example.com", name="Bench Owner", is_verified=True)
+    owner.set_password("benchmark")
+    project = Project(name="Bench", owner=owner)
+    db.session.add(project)
+    db.session.commit()
+
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1)
+    db.session.execute(
+        insert(Task),
+        [
+            {
+                "project_id": project.id,
+                "title": f"Task {index}",
+                "status": TaskStatus.DONE if index % 10 == 0 else TaskStatus.TODO,
+                "due_date": start + timedelta(hours=rng.randrange(24 * 90)),
+                "created_by_id": owner.id,
+            }
+            for index in range(tasks)
+        ],
+    )
+    # Blockers always have a lower id, so the graph is acyclic by construction.
+    edges = {
+        (task_id, blocker_id)
+        for task_id in range(2, tasks + 1)
+        for blocker_id in rng.sample(range(1, task_id), min(fanin, task_id - 1))
+    }
+    db.session.execute(
+        insert(task_dependencies),
+        [
+            {"project_id": project.id, "task_id": task_id, "blocker_id": blocker_id}
+            for task_id, blocker_id in edges
+        ],
+    )
+    db.session.commit()
+    return project.id
+
+
+def _time(call, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--fanin", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp, 'bench.db').as_posix()}"
+        from app import create_app
+        from app.extensions import db
+        from app.models import Task
+        from app.projects.schedule import get_schedule
+
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            project_id = _seed(args.tasks, args.fanin)
+
+            cold = _time(lambda: get_schedule(project_id))
+            warm = _time(lambda: get_schedule(project_id), args.repeat)
+
+            task = db.session.get(Task, args.tasks)
+            task.due_date += timedelta(days=1)
+            db.session.commit()
+            edited = _time(lambda: get_schedule(project_id))
+
+            result = get_schedule(project_id)
+            print(f"{args.tasks} tasks, critical path of {len(result.critical_path)}")
+            print(f"cold            {cold * 1000:8.1f} ms")
+            print(f"cached          {warm * 1000:8.2f} ms")
+            print(f"after an edit   {edited * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure gunicorn time-to-ready and per-worker memory with and without preload.
+
+Each variant boots ``wsgi:app`` through ``gunicorn.conf.py`` and polls the
+startup probe until it answers. The script then reads RSS, PSS and private
+memory for every worker from ``/proc/<pid>/smaps_rollup``. PSS counts shared
+pages fractionally, so it shows how much copy-on-write sharing preload and
+``gc.freeze()`` buy (Linux only)::
+
+    python -m benchmarks.startup --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+VARIANTS = {
+    "preload": "true",
+    "no-preload": "false",
+}
+
+
+def _smaps(pid: int) -> dict[str, int]:
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        values[key] = int(value.split()[0])
+    return values
+
+
+def _worker_pids(master: int) -> list[int]:
+    children = Path(f"/proc/{master}/task/{master}/children").read_text().split()
+    return [int(pid) for pid in children]
+
+
+def _wait_ready(url: str, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def run(variant: str, args: argparse.Namespace, env: dict[str, str]) -> dict[str, float]:
+    command = [
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+        "-b", f"127.0.0.1:{args.port}", "-w", str(args.workers), "wsgi:app",
+    ]
+    env = {**env, "GUNICORN_PRELOAD": VARIANTS[variant], "GUNICORN_ACCESSLOG": ""}
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    try:
+        ready = _wait_ready(f"http://127.0.0.1:{args.port}/healthz/startup")
+        # Let every worker finish booting before sampling memory.
+        deadline = time.monotonic() + 30
+        while len(_worker_pids(process.pid)) < args.workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+        time.sleep(args.settle)
+        samples = [_smaps(pid) for pid in _worker_pids(process.pid)]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+
+    count = len(samples) or 1
+    return {
+        "ready_s": ready,
+        "rss_mb": sum(s["Rss"] for s in samples) / count / 1024,
+        "pss_mb": sum(s["Pss"] for s in samples) / count / 1024,
+        "private_mb": sum(s["Private_Clean"] + s["Private_Dirty"] for s in samples) / count / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--settle", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp, 'bench.db').as_posix()}",
+            "GUNICORN_THREADS": "1",
+        }
+        for variant in VARIANTS:
+            result = run(variant, args, env)
+            print(
+                f"{variant:<11} ready {result['ready_s']:6.2f} s  per worker: "
+                f"RSS {result['rss_mb']:6.1f} MB  PSS {result['pss_mb']:6.1f} MB  "
+                f"private {result['private_mb']:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
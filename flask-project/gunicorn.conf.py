@@ -0,0 +1,96 @@
+"""Gunicorn settings for ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Every value can be overridden through the environment, e.g.
+``GUNICORN_WORKERS=4 GUNICORN_THREADS=8``.
+"""
+
+import os
+import sys
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+
+cpus = _cpu_count()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", cpus * 2 + 1))
+# Threads overlap the SMTP and database waits inside each worker.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Build the app once in the master; see wsgi.py.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycle workers to bound slow leaks; the jitter keeps them from restarting together.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-") or None
+
+
+def _sessions_in_worker_memory() -> bool:
+    from app.utils.sessions import MemorySessionStore
+
+    wsgi = sys.modules.get("wsgi")
+    if wsgi is not None:
+        sessions = wsgi.app.extensions.get("server_sessions")
+        return sessions is not None and isinstance(sessions.interface.store, MemorySessionStore)
+
+    # Not preloaded: read the settings wsgi.py will build the app with.
+    from werkzeug.utils import import_string
+
+    from app.config import ProductionConfig
+
+    store = ProductionConfig.SESSION_STORE
+    if not ProductionConfig.SESSION_SERVER_SIDE or not store:
+        return False
+    if isinstance(store, str):
+        store = import_string(store)
+    store_type = store if isinstance(store, type) else type(store)
+    return issubclass(store_type, MemorySessionStore)
+
+
+def on_starting(server):
+    # Gunicorn reports a RuntimeError here and exits before binding.
+    if server.cfg.workers > 1 and _sessions_in_worker_memory():
+        raise RuntimeError(
+            "Server-side sessions use MemorySessionStore, which each of the "
+            f"{server.cfg.workers} workers would keep separately. Point SESSION_STORE "
+            "at a shared backend or run a single worker (GUNICORN_WORKERS=1)."
+        )
+
+
+def when_ready(server):
+    # Only inspect the app when it was preloaded; importing it here otherwise
+    # would build it in the master anyway.
+    wsgi = sys.modules.get("wsgi")
+    if wsgi is None:
+        return
+    server.log.info(
+        "Ready: %s workers x %s threads, app built in %ss.",
+        server.cfg.workers,
+        server.cfg.threads,
+        wsgi.app.extensions.get("startup", {}).get("boot_seconds"),
+    )
+    if server.cfg.workers > 1 and wsgi.app.config.get("RATELIMIT_STORE") is None:
+        server.log.warning("RATELIMIT_STORE is unset: each worker keeps its own in-memory counters.")
+
+
+def post_fork(server, worker):
+    wsgi = sys.modules.get("wsgi")
+    if wsgi is None:
+        return
+    from app.extensions import db
+
+    with wsgi.app.app_context():
+        # Drop any connection inherited from the master without closing it there.
+        db.engine.dispose(close=False)
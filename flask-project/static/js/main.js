@@ -249,6 +249,20 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     const taskModal = document.getElementById('task-modal');
+    // Fields compared when a save loses a race; keys match the server's task state.
+    const TASK_FIELDS = [
+        'title',
+        'description',
+        'status',
+        'assignee_id',
+        'due_date',
+        'recurrence',
+        'recurrence_interval',
+        'recurrence_until',
+        'recurrence_count',
+    ];
+    const MAX_MERGE_RETRIES = 3;
+    let taskEditBase = null;
     let taskForm;
     let titleTarget;
     let createTitle = '';
@@ -271,6 +285,103 @@ document.addEventListener('DOMContentLoaded', () => {
                 openModal(modal);
             });
         });
+
+        taskForm?.addEventListener('submit', (event) => {
+            if (taskForm.dataset.mode !== 'edit' || !taskEditBase) return;
+            event.preventDefault();
+            submitTaskEdit(0);
+        });
+    }
+
+    function readTaskForm() {
+        const values = {};
+        TASK_FIELDS.forEach((name) => {
+            const field = taskForm.querySelector(`[name="${name}"]`);
+            values[name] = field ? field.value : '';
+        });
+        return values;
+    }
+
+    function writeTaskForm(values) {
+        TASK_FIELDS.forEach((name) => {
+            if (name === 'assignee_id') {
+                selectAssigneeOption(values[name]);
+                return;
+            }
+            const field = taskForm.querySelector(`[name="${name}"]`);
+            if (field) field.value = values[name] ?? '';
+        });
+    }
+
+    function fieldLabel(name) {
+        const field = taskForm.querySelector(`[name="${name}"]`);
+        return field?.closest('label')?.querySelector('span')?.textContent?.trim() || name;
+    }
+
+    // Three-way merge: keep our edits, take theirs where we left a field alone,
+    // and report fields both sides changed to different values.
+    function mergeTaskEdit(base, mine, theirs) {
+        const merged = {};
+        const conflicts = [];
+        TASK_FIELDS.forEach((name) => {
+            const original = String(base[name] ?? '');
+            const ours = String(mine[name] ?? '');
+            const current = String(theirs[name] ?? '');
+            if (ours === original) {
+                merged[name] = current;
+            } else {
+                merged[name] = ours;
+                if (current !== original && current !== ours) {
+                    conflicts.push(name);
+                }
+            }
+        });
+        return { merged, conflicts };
+    }
+
+    function submitTaskEdit(attempt) {
+        const submitButton = taskForm.querySelector('[type="submit"]');
+        if (submitButton) submitButton.disabled = true;
+        fetch(taskForm.action, {
+            method: 'POST',
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest',
+                Accept: 'application/json',
+            },
+            body: new FormData(taskForm),
+            // Keep the redirect unfollowed so its flash message survives the reload.
+            redirect: 'manual',
+        })
+            .then((response) => {
+                if (response.status !== 409) {
+                    window.location.reload();
+                    return null;
+                }
+                return response.json().then((data) => {
+                    const current = data.task;
+                    const { merged, conflicts } = mergeTaskEdit(taskEditBase, readTaskForm(), current);
+                    writeTaskForm(merged);
+                    const versionField = taskForm.querySelector('[name="version"]');
+                    if (versionField) versionField.value = current.version;
+                    taskEditBase = Object.fromEntries(TASK_FIELDS.map((name) => [name, String(current[name] ?? '')]));
+                    if (!conflicts.length && attempt < MAX_MERGE_RETRIES) {
+                        submitTaskEdit(attempt + 1);
+                        return;
+                    }
+                    const fields = conflicts.map(fieldLabel).join(', ');
+                    addFlashMessage(
+                        'warning',
+                        fields
+                            ? `${data.message} Changed by both of you: ${fields}. Save again to keep your values.`
+                            : data.message
+                    );
+                    if (submitButton) submitButton.disabled = false;
+                });
+            })
+            .catch(() => {
+                addFlashMessage('danger', 'Unexpected error saving task.');
+                if (submitButton) submitButton.disabled = false;
+            });
     }
 
     function selectAssigneeOption(value) {
@@ -294,6 +405,15 @@ document.addEventListener('DOMContentLoaded', () => {
         const descriptionField = taskForm.querySelector('[name="description"]');
         const statusField = taskForm.querySelector('[name="status"]');
         const dueField = taskForm.querySelector('[name="due_date"]');
+        const recurrenceField = taskForm.querySelector('[name="recurrence"]');
+        const intervalField = taskForm.querySelector('[name="recurrence_interval"]');
+        const untilField = taskForm.querySelector('[name="recurrence_until"]');
+        const countField = taskForm.querySelector('[name="recurrence_count"]');
+
+        const versionField = taskForm.querySelector('[name="version"]');
+        taskEditBase = null;
+        // Hidden inputs ignore form.reset(), so clear the version explicitly.
+        if (versionField) versionField.value = '';
 
         if (isCreate) {
             if (createAction) taskForm.action = createAction;
@@ -315,8 +435,14 @@ document.addEventListener('DOMContentLoaded', () => {
         if (descriptionField) descriptionField.value = dataset.description || '';
         if (statusField) statusField.value = dataset.status || statusField.value;
         if (dueField) dueField.value = dataset.due || '';
+        if (recurrenceField) recurrenceField.value = dataset.recurrence || '';
+        if (intervalField) intervalField.value = dataset.recurrenceInterval || '1';
+        if (untilField) untilField.value = dataset.recurrenceUntil || '';
+        if (countField) countField.value = dataset.recurrenceCount || '';
+        if (versionField) versionField.value = dataset.version || '';
         const assigneeValue = dataset.assignee ?? assigneeSelect?.options[0]?.value ?? '0';
         selectAssigneeOption(assigneeValue);
+        taskEditBase = readTaskForm();
     }
     const STATUS_LABELS = {
         todo: 'To do',
@@ -445,39 +571,94 @@ document.addEventListener('DOMContentLoaded', () => {
                 const previousIndex = card.dataset.originIndex;
                 card.dataset.status = newStatus;
                 refreshTaskBoardStats();
-                updateTaskStatus(projectId, taskId, newStatus, csrfToken)
-                    .then(() => {
-                        card.dataset.originStatus = newStatus;
-                        card.dataset.originIndex = String(
-                            Array.from(card.parentElement?.children || []).indexOf(card)
-                        );
-                        const chip = card.querySelector('.chip.subtle');
-                        if (chip) {
-                            chip.textContent = STATUS_LABELS[newStatus] || newStatus;
-                        }
-                        const editTrigger = card.querySelector('[data-edit-task]');
-                        if (editTrigger) {
-                            editTrigger.dataset.status = newStatus;
-                        }
-                        refreshTaskBoardStats();
-                    })
-                    .catch(() => {
-                        card.dataset.status = previousStatus;
-                        const originColumn = board.querySelector(
-                            `.task-column[data-status="${card.dataset.originStatus}"]`
-                        );
-                        const originContainer = getTasksContainer(originColumn);
-                        if (originContainer) {
-                            const children = Array.from(originContainer.children);
-                            const index = Number(previousIndex);
-                            if (Number.isInteger(index) && index >= 0 && index < children.length) {
-                                originContainer.insertBefore(card, children[index]);
-                            } else {
-                                originContainer.appendChild(card);
-                            }
+                commitMove(card, taskId, newStatus, previousStatus, previousIndex, 0);
+            });
+        }
+
+        function commitMove(card, taskId, newStatus, previousStatus, previousIndex, attempt) {
+            updateTaskStatus(projectId, taskId, newStatus, csrfToken, card.dataset.version)
+                .then(({ ok, status, data }) => {
+                    if (ok) {
+                        settleCard(card, newStatus, data.version);
+                        return;
+                    }
+                    if (status !== 409 || !data?.task) {
+                        throw new Error('Failed to update task status');
+                    }
+                    const current = data.task;
+                    applyTaskState(card, current);
+                    if (current.status === previousStatus && attempt < MAX_MERGE_RETRIES) {
+                        // Only other fields changed; the move still applies on top.
+                        commitMove(card, taskId, newStatus, previousStatus, previousIndex, attempt + 1);
+                        return;
+                    }
+                    if (current.status !== newStatus) {
+                        // Someone else moved it first; show where it really is.
+                        getTasksContainer(board.querySelector(`.task-column[data-status="${current.status}"]`))
+                            ?.appendChild(card);
+                        addFlashMessage('warning', data.message);
+                    }
+                    settleCard(card, current.status, current.version);
+                })
+                .catch(() => {
+                    card.dataset.status = previousStatus;
+                    const originColumn = board.querySelector(
+                        `.task-column[data-status="${card.dataset.originStatus}"]`
+                    );
+                    const originContainer = getTasksContainer(originColumn);
+                    if (originContainer) {
+                        const children = Array.from(originContainer.children);
+                        const index = Number(previousIndex);
+                        if (Number.isInteger(index) && index >= 0 && index < children.length) {
+                            originContainer.insertBefore(card, children[index]);
+                        } else {
+                            originContainer.appendChild(card);
                         }
-                        refreshTaskBoardStats();
-                    });
+                    }
+                    refreshTaskBoardStats();
+                });
+        }
+
+        function settleCard(card, status, version) {
+            card.dataset.status = status;
+            card.dataset.originStatus = status;
+            card.dataset.originIndex = String(
+                Array.from(card.parentElement?.children || []).indexOf(card)
+            );
+            const chip = card.querySelector('[data-task-status-chip]');
+            if (chip) {
+                chip.textContent = STATUS_LABELS[status] || status;
+            }
+            const editTrigger = card.querySelector('[data-edit-task]');
+            if (editTrigger) {
+                editTrigger.dataset.status = status;
+            }
+            if (version !== undefined) {
+                card.dataset.version = String(version);
+                if (editTrigger) editTrigger.dataset.version = String(version);
+            }
+            refreshTaskBoardStats();
+        }
+
+        // Refresh a card's edit data from the server so the next edit starts
+        // from the version it carries.
+        function applyTaskState(card, state) {
+            card.dataset.version = String(state.version);
+            const heading = card.querySelector('.task-head h4');
+            if (heading) heading.textContent = state.title;
+            const editTrigger = card.querySelector('[data-edit-task]');
+            if (!editTrigger) return;
+            Object.assign(editTrigger.dataset, {
+                title: state.title,
+                description: state.description,
+                status: state.status,
+                assignee: String(state.assignee_id),
+                due: state.due_date,
+                recurrence: state.recurrence,
+                recurrenceInterval: String(state.recurrence_interval),
+                recurrenceUntil: state.recurrence_until,
+                recurrenceCount: String(state.recurrence_count),
+                version: String(state.version),
             });
         }
 
@@ -501,19 +682,21 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function updateTaskStatus(projectId, taskId, status, csrfToken) {
+    function updateTaskStatus(projectId, taskId, status, csrfToken, version) {
+        const payload = { status };
+        if (version) payload.version = Number(version);
         return fetch(`/projects/${projectId}/tasks/${taskId}/move`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
                 'X-CSRFToken': csrfToken || '',
             },
-            body: JSON.stringify({ status }),
-        }).then((response) => {
-            if (!response.ok) {
-                throw new Error('Failed to update task status');
-            }
-            return response.json();
-        });
+            body: JSON.stringify(payload),
+        }).then((response) =>
+            response
+                .json()
+                .catch(() => null)
+                .then((data) => ({ ok: response.ok, status: response.status, data }))
+        );
     }
 });
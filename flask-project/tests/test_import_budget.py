@@ -0,0 +1,36 @@
+"""Dependencies only some pages or commands need must not load at boot."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# A fresh interpreter, so nothing imported by pytest or other tests leaks in.
+BOOT = """
+import json, sys
+from app import create_app
+create_app()
+loaded = set(sys.modules)
+from benchmarks.imports import DEFERRED
+print(json.dumps({"deferred": DEFERRED, "loaded": sorted(loaded)}))
+"""
+
+
+def test_create_app_leaves_deferred_modules_unimported():
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": "sqlite://"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.splitlines()[-1])
+    loaded = set(report["loaded"])
+
+    assert "pyotp" in report["deferred"] and "qrcode" in report["deferred"]
+    eager = [name for name in report["deferred"] if name in loaded]
+    assert eager == [], f"imported by create_app(): {', '.join(eager)}"
@@ -0,0 +1,77 @@
+"""Delta sync must deliver every change made after the client's cursor."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Membership, Project, Role, Task, User, task_members  # noqa: E402
+
+
+class SyncTestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    MAIL_USERNAME = None
+    RATELIMIT_ENABLED = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(SyncTestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def task(app):
+    owner = User(email="owner@example.com", name="Owner", is_verified=True)
+    member = User(email="member@example.com", name="Member", is_verified=True)
+    for user in (owner, member):
+        user.set_password("password123")
+    project = Project(name="Launch", owner=owner)
+    task = Task(title="Write notes", project=project, creator=owner, assignees=[owner])
+    db.session.add_all([owner, member, project, task])
+    db.session.add(Membership(user=member, project=project, role=Role.MEMBER))
+    db.session.commit()
+    return task
+
+
+def _sync(app, user_id, cursor=None):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    response = client.get("/sync", query_string={"cursor": cursor} if cursor else None)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_assignee_change_reaches_next_delta(app, task):
+    owner_id, member = task.created_by_id, User.query.filter_by(email="member@example.com").one()
+    cursor = _sync(app, owner_id)["cursor"]
+
+    task.assignees = [member]
+    db.session.commit()
+
+    delta = _sync(app, owner_id, cursor)
+    assert [(row["id"], row["assignee_ids"]) for row in delta["tasks"]] == [(task.id, [member.id])]
+
+
+def test_core_link_insert_reaches_next_delta(app, task):
+    owner_id, member = task.created_by_id, User.query.filter_by(email="member@example.com").one()
+    cursor = _sync(app, owner_id)["cursor"]
+
+    db.session.execute(task_members.insert(), [{"task_id": task.id, "user_id": member.id}])
+    db.session.commit()
+
+    delta = _sync(app, owner_id, cursor)
+    assert [(row["id"], sorted(row["assignee_ids"])) for row in delta["tasks"]] == [
+        (task.id, sorted([owner_id, member.id]))
+    ]